@@ -1,17 +1,93 @@
 import logging
-from json import JSONDecodeError, loads
+from functools import partial
+from math import ceil
+from json import JSONDecodeError
+from threading import RLock
 from time import sleep
 from requests import Session, ConnectionError, ConnectTimeout, Response
-from typing import Optional, Union, Any
-from urllib.parse import urlencode
-
-from .errors import AmoException
+from typing import Optional, Union, Any, Dict, Iterable, Iterator
+from urllib.parse import quote_plus, urlencode
+
+from .changes import ChangeFeed
+from .checkpoints import Checkpoint
+from .codec import JsonCodec, default_codec
+from .concurrency import RateLimiter, run_concurrently
+from .errors import AmoException, AmoValidationError
+from .idset import IdSet
+from .models import MODELS, LazyPage, LazyRecord, Model
+from .pipelines import PipelineResolver
+from .projection import Projection
+from .query import QuerySpec
+from .scanning import (
+    Window,
+    in_windows,
+    split_window,
+    uncovered_window,
+    window_filters,
+)
+from .schema import CustomFieldSchema
+from .streaming import JSON_ERRORS, iter_embedded
+from .tags import TagRegistry
+from .users import UserDirectory
+from .validation import PayloadValidator
 
 logger = logging.getLogger("amocrm_wrapper")
 
+MAX_LIMIT = 250
+LINKS_CHUNK_SIZE = 100
+BULK_CHUNK_SIZE = 50
+# date fields which list endpoints can sort by, used by scans
+SCAN_ORDER_FIELDS = {
+    "leads": ("created_at", "updated_at"),
+    "contacts": ("created_at", "updated_at"),
+    "companies": ("created_at", "updated_at"),
+    "tasks": ("created_at",),
+}
+# entities with str ids like "01pz58t6p04ymgsgfbmfyfy1mf", deduplicated by set
+STR_ID_ENTITIES = ("events",)
+# max length of filter[id][]=id params in one url, fits MAX_LIMIT ids of 10 digits
+FILTER_IDS_QUERY_LENGTH = 6500
+
+
+def split_filter_ids(
+    filter_ids: list,
+    max_length: int = FILTER_IDS_QUERY_LENGTH,
+    max_ids: int = MAX_LIMIT,
+) -> list:
+    """split ids into chunks which filter[id][]=id query fits into max_length,
+    chunk has at most max_ids ids, so one page returns whole chunk
+
+    Returns:
+        list: list of ids lists, one chunk if all ids fit
+    """
+    chunks: list = []
+    chunk: list = []
+    length = 0
+    for id_ in filter_ids:
+        param_length = len(f"filter[id][]={quote_plus(str(id_))}&")
+        if chunk and (length + param_length > max_length or len(chunk) >= max_ids):
+            chunks.append(chunk)
+            chunk, length = [], 0
+        chunk.append(id_)
+        length += param_length
+    if chunk or not chunks:
+        chunks.append(chunk)
+    return chunks
+
 
 class BaseClient(object):
     crm_url: str = ""
+    json_codec: JsonCodec = default_codec
+    max_workers: int = 4
+
+    def __init__(self) -> None:
+        self.rate_limiter: Optional[RateLimiter] = RateLimiter()
+        # guards session and auth updates made by worker threads
+        self._session_lock = RLock()
+        self._custom_field_schemas: dict = {}
+        self._pipeline_resolver: Optional[PipelineResolver] = None
+        self._user_directory: Optional[UserDirectory] = None
+        self._tag_registries: dict = {}
 
     def _init_session(self, headers: Optional[dict] = None) -> Session:
         raise NotImplementedError()
@@ -22,30 +98,59 @@ class BaseClient(object):
         Args:
             params (dict): like {'IF-MODIFIED-SINCE': <datetime>}
         """
-        self._session = self._init_session(params)
+        with self._session_lock:
+            self._session = self._init_session(params)
 
     def _parse_response_body(self, response: Response) -> dict:
-        raw_data = response.content.decode("utf-8")
+        raw_data = response.content
         if not raw_data:
             return {}
-        data = loads(raw_data)
-        return data
+        return self.json_codec.loads(raw_data)
+
+    def _request(self, method: str, url: str, data: Any = None, **kwargs) -> Response:
+        """send http request, body is serialised with json_codec
+
+        Args:
+            method (str): http method like 'get'
+            url (str): full url
+            data (Any, optional): json serialisable body. Defaults to None.
+
+        Returns:
+            Response: http response
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        if data is None:
+            return self._session.request(method, url, **kwargs)
+        headers = {"Content-Type": "application/json"}
+        body = self.json_codec.dumps(data)
+        return self._session.request(method, url, data=body, headers=headers, **kwargs)
 
     def _send_api_request(
-        self, method: str, url: str, data: Any = None, _connection_counter: int = 0
+        self,
+        method: str,
+        url: str,
+        data: Any = None,
+        _connection_counter: int = 0,
+        projection: Optional[Projection] = None,
     ) -> dict:
+        session = self._session
         try:
-            response = self._session.__getattribute__(method)(url, json=data)
+            response = self._request(method, url, data)
             if response.status_code == 204:
                 return {}
             elif response.status_code == 429:
                 sleep(20)
                 logger.warning("429 http error, sleep 20 sec")
-                return self._send_api_request(method, url, data)
+                return self._send_api_request(
+                    method, url, data, projection=projection
+                )
             data = self._parse_response_body(response)
             if "error" in data or response.status_code >= 400:
                 raise AmoException(data, code=response.status_code)
             json_data = data["response"] if "response" in data else data
+            if projection is not None:
+                json_data = projection.apply(json_data)
             return json_data
         except JSONDecodeError as e:
             raise AmoException({"error": str(e)}, code=500)
@@ -53,35 +158,74 @@ class BaseClient(object):
             if _connection_counter > 3:
                 raise
             sleep(5)
-            self._update_session()
+            self._update_session(session)
             _connection_counter += 1
-            return self._send_api_request(method, url, data, _connection_counter)
-
-    def _update_session(self):
-        self._session = self._init_session(dict(self._session.headers))
-
-    def __create_filter_query(self, filters: dict) -> dict:
-        filter_query = {}
-        update_from = filters.pop("updated_at__from", None)
-        update_to = filters.pop("updated_at__to", None)
-        created_from = filters.pop("created_at__from", None)
-        created_to = filters.pop("created_at__to", None)
-        closed_from = filters.pop("closed_at__from", None)
-        closed_to = filters.pop("closed_at__to", None)
-        if update_from:
-            filter_query["filter[updated_at][from]"] = update_from
-        if update_to:
-            filter_query["filter[updated_at][to]"] = update_to
-        if created_from:
-            filter_query["filter[created_at][from]"] = created_from
-        if created_to:
-            filter_query["filter[created_at][to]"] = created_to
-        if closed_from:
-            filter_query["filter[closed_at][from]"] = closed_from
-        if closed_to:
-            filter_query["filter[closed_at][to]"] = created_to
-        filter_query.update({f"filter[{k}]": v for k, v in filters.items()})
-        return filter_query
+            return self._send_api_request(
+                method, url, data, _connection_counter, projection=projection
+            )
+
+    def _open_stream(self, url: str, _connection_counter: int = 0) -> Optional[Response]:
+        """open GET response without reading body
+
+        Args:
+            url (str): full url
+
+        Raises:
+            AmoException: if error status
+
+        Returns:
+            Optional[Response]: response, None if no content
+        """
+        session = self._session
+        try:
+            response = self._request("get", url, stream=True)
+        except (ConnectTimeout, ConnectionError):
+            if _connection_counter > 3:
+                raise
+            sleep(5)
+            self._update_session(session)
+            return self._open_stream(url, _connection_counter + 1)
+        if response.status_code == 204:
+            response.close()
+            return None
+        elif response.status_code == 429:
+            response.close()
+            sleep(20)
+            logger.warning("429 http error, sleep 20 sec")
+            return self._open_stream(url)
+        elif response.status_code >= 400:
+            try:
+                data = self._parse_response_body(response)
+            except JSONDecodeError as e:
+                data = {"error": str(e)}
+            raise AmoException(data, code=response.status_code)
+        response.raw.decode_content = True
+        return response
+
+    def _stream_entities(
+        self, url: str, key: str, projection: Optional[Projection] = None
+    ) -> Iterator[dict]:
+        response = self._open_stream(url)
+        if response is None:
+            return
+        try:
+            items = iter_embedded(response.raw, key, self.json_codec)
+            if projection is None:
+                yield from items
+            else:
+                for item in items:
+                    yield projection.apply_entity(item)
+        except JSON_ERRORS as e:
+            raise AmoException({"error": str(e)}, code=500)
+        finally:
+            response.close()
+
+    def _update_session(self, failed_session: Optional[Session] = None) -> None:
+        """recreate session, skipped if other thread already replaced failed_session"""
+        with self._session_lock:
+            if failed_session is not None and self._session is not failed_session:
+                return
+            self._session = self._init_session(dict(self._session.headers))
 
     def _get_entities(
         self,
@@ -92,22 +236,430 @@ class BaseClient(object):
         filters: Optional[dict] = None,
         filter_ids: Optional[list] = None,
         order: Optional[dict] = None,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        lazy: bool = False,
+    ) -> Union[dict, LazyPage]:
+        key = entity.split("/")[-1]
+        chunks = split_filter_ids(filter_ids) if filter_ids else []
+        if len(chunks) > 1:
+            data = self._get_entities_by_id_chunks(
+                entity, limit, with_params, filters, chunks, order, fields, drop_links
+            )
+            return LazyPage(data, key) if lazy else data
+        query = QuerySpec.cached(entity, limit, with_params, filters, filter_ids, order)
+        return self.get_query_page(query, page, fields, drop_links, lazy)
+
+    def _get_entities_by_id_chunks(
+        self,
+        entity: str,
+        limit: int,
+        with_params: Optional[list],
+        filters: Optional[dict],
+        chunks: list,
+        order: Optional[dict],
+        fields: Optional[list] = None,
+        drop_links: bool = False,
     ) -> dict:
-        url = f"{self.crm_url}/api/v4/{entity}"
-        params: dict = {"limit": limit, "page": page}
-        if with_params:
-            params["with"] = ",".join(param for param in with_params)  # type: ignore
-        if filters:
-            filter_query = self.__create_filter_query(filters)
-            params.update(filter_query)
-        if filter_ids:
-            query = {f'filter[id][{index}]': id_ for index, id_ in enumerate(filter_ids)}
-            params.update(query)
-        if order:
-            order_query = {f"order[{k}]": v for k, v in order.items()}
-            params.update(order_query)
-        url = f"{url}?{urlencode(params)}"
-        return self._send_api_request("get", url)
+        """fetch all pages of every filter_ids chunk concurrently
+
+        Returns:
+            dict: {'_embedded': {<entity>: objects}}, objects in chunks order without duplicates
+        """
+
+        def get_chunk(ids: list) -> list:
+            items = self._iter_entities(
+                entity,
+                limit,
+                1,
+                with_params,
+                filters,
+                ids,
+                order,
+                fields=fields,
+                drop_links=drop_links,
+            )
+            return list(items)
+
+        args_list = [(ids,) for ids in chunks]
+        merged: dict = {}
+        for items in run_concurrently(get_chunk, args_list, self.max_workers):
+            for item in items:
+                merged.setdefault(item.get("id"), item)
+        return {"_embedded": {entity.split("/")[-1]: list(merged.values())}}
+
+    def _iter_entities(
+        self,
+        entity: str,
+        limit: int = 250,
+        page: int = 1,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+        order: Optional[dict] = None,
+        stream: bool = False,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        model: bool = False,
+        lazy: bool = False,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[Any]:
+        """iterate over entities of all pages starting from `page`
+
+        Args:
+            entity (str): name of entities like 'leads'
+            filter_ids (Optional[list], optional): ids too long for one url are
+                split into chunks, every chunk is read from page 1. Defaults to None.
+            stream (bool, optional): parse every page incrementally and yield
+                objects while body is being read. Defaults to False.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            model (bool, optional): yield records from models.MODELS instead of dicts. Defaults to False.
+            lazy (bool, optional): yield models.LazyRecord views instead of dicts. Defaults to False.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume iteration,
+                not supported with filter_ids split into chunks. Defaults to None.
+
+        Raises:
+            ValueError: if checkpoint is used with filter_ids split into chunks
+
+        Returns:
+            Iterator[Any]: objects from `_embedded.<entity>`
+        """
+        chunks = split_filter_ids(filter_ids) if filter_ids else []
+        if len(chunks) > 1:
+            if checkpoint is not None:
+                raise ValueError("checkpoint is not supported with chunked filter_ids")
+            for ids in chunks:
+                yield from self._iter_entities(
+                    entity,
+                    limit,
+                    1,
+                    with_params,
+                    filters,
+                    ids,
+                    order,
+                    stream,
+                    fields,
+                    drop_links,
+                    model,
+                    lazy,
+                )
+            return
+        query = QuerySpec.cached(entity, limit, with_params, filters, filter_ids, order)
+        yield from self.iter_query(
+            query, page, stream, fields, drop_links, model, lazy, checkpoint
+        )
+
+    def get_query_page(
+        self,
+        query: QuerySpec,
+        page: int = 1,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        lazy: bool = False,
+    ) -> Union[dict, LazyPage]:
+        """Get one page of compiled query
+        Args:
+            query (QuerySpec): query like QuerySpec.create('leads', filters={...})
+            page (int, optional): number of page. Defaults to 1.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            lazy (bool, optional): return LazyPage of LazyRecord views. Defaults to False.
+
+        Returns:
+            dict: page like get_leads
+        """
+        key = query.entity
+        projection = Projection.create(fields, drop_links, key)
+        url = query.url(self.crm_url, page)
+        data = self._send_api_request("get", url, projection=projection)
+        return LazyPage(data, key) if lazy else data
+
+    def iter_query(
+        self,
+        query: QuerySpec,
+        page: int = 1,
+        stream: bool = False,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        model: bool = False,
+        lazy: bool = False,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[Any]:
+        """Iterate over objects of all pages of compiled query starting from `page`
+        Args:
+            query (QuerySpec): query, can be shared by threads and reused
+            params like in _iter_entities
+            checkpoint (Optional[Checkpoint], optional): next page and last id are saved
+                after all objects of page are consumed, iteration resumes from saved page,
+                objects up to last id are skipped if they moved to it, checkpoint is
+                cleared when last page is consumed. Defaults to None.
+
+        Returns:
+            Iterator[Any]: objects from `_embedded.<entity>`
+        """
+        key = query.entity
+        projection = Projection.create(fields, drop_links, key)
+        convert = None
+        if model:
+            convert = MODELS[key].from_dict
+        elif lazy:
+            convert = partial(LazyRecord, key=key)
+        last_id = None
+        if checkpoint is not None:
+            state = checkpoint.load(query.signature)
+            if state is not None:
+                page = state["page"]
+                last_id = state.get("last_id")
+        while True:
+            url = query.url(self.crm_url, page)
+            if stream:
+                items = self._stream_entities(url, key, projection)
+            else:
+                data = self._send_api_request("get", url, projection=projection)
+                items = data.get("_embedded", {}).get(key, [])
+            count = 0
+            last: dict = {}
+            if last_id is not None:
+                # objects added before position shift already returned ones to resumed page
+                items = list(items)
+                ids = [item.get("id") for item in items]
+                if last_id in ids:
+                    count = ids.index(last_id) + 1
+                    last = items[count - 1]
+                    items = items[count:]
+                last_id = None
+            for item in items:
+                count += 1
+                last = item
+                yield item if convert is None else convert(item)
+            if (stream and count < query.limit) or (
+                not stream and "next" not in data.get("_links", {})
+            ):
+                if checkpoint is not None:
+                    checkpoint.clear()
+                return
+            page += 1
+            if checkpoint is not None:
+                checkpoint.save(query.signature, page=page, last_id=last.get("id"))
+
+    def _scan_window(
+        self,
+        entity: str,
+        window: Window,
+        date_field: str,
+        split: int,
+        limit: int,
+        with_params: Optional[list],
+        filters: dict,
+        fields: Optional[list],
+        drop_links: bool,
+    ) -> tuple:
+        """read window, rest of dense window is returned as sub windows after first page
+
+        First page is sorted by date_field if entity supports it, so sub windows
+        cover only dates after first page objects. Window is split whole if
+        objects of first page are not sorted.
+
+        Returns:
+            tuple: (objects, sub windows to scan)
+        """
+        order = None
+        if date_field in SCAN_ORDER_FIELDS.get(entity, ()):
+            order = {date_field: "asc"}
+        if fields:
+            fields = list(fields) + [date_field]
+        query = QuerySpec.create(
+            entity,
+            limit,
+            with_params,
+            window_filters(filters, date_field, window),
+            order=order,
+        )
+        data = self.get_query_page(query, 1, fields, drop_links)
+        items = data.get("_embedded", {}).get(query.entity, [])
+        if "next" not in data.get("_links", {}):
+            return items, []
+        start, end = window
+        if end - start > 0:
+            rest = uncovered_window(window, [item[date_field] for item in items])
+            if rest is None or rest == window:
+                return items, split_window(start, end, split)
+            # rest is split by density of first page
+            covered = (end - start) - (rest[1] - rest[0]) + 1
+            expected = len(items) * (rest[1] - rest[0] + 1) / covered
+            parts = min(split, max(1, ceil(expected / limit)))
+            return items, split_window(rest[0], rest[1], parts)
+        items.extend(self.iter_query(query, 2, fields=fields, drop_links=drop_links))
+        return items, []
+
+    def _scan_entities(
+        self,
+        entity: str,
+        start: int,
+        end: int,
+        date_field: str = "updated_at",
+        windows: Optional[int] = None,
+        limit: int = 250,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        max_workers: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[dict]:
+        """scan [start, end] range of date_field by windows read concurrently
+
+        Windows which have more than one page are split again, objects
+        are deduplicated by id across windows, order of objects is not kept.
+
+        Args:
+            entity (str): name of entities like 'leads'
+            start (int): timestamp from, included
+            end (int): timestamp to, included
+            date_field (str, optional): updated_at or created_at. Defaults to "updated_at".
+            windows (Optional[int], optional): number of first windows. Defaults to max_workers.
+            max_workers (Optional[int], optional): concurrent requests. Defaults to client max_workers.
+            checkpoint (Optional[Checkpoint], optional): not scanned windows and ids
+                which they can return again (objects of split windows on boundary dates)
+                are saved after every consumed window, scan resumes from saved windows,
+                checkpoint is cleared when scan is done. Defaults to None.
+
+        Returns:
+            Iterator[dict]: objects of all windows
+        """
+        workers = max_workers or self.max_workers
+        split = max(2, workers)
+        filters = dict(filters or {})
+        pending = split_window(start, end, windows or workers)
+        str_ids = entity in STR_ID_ENTITIES
+        seen: Any = set() if str_ids else IdSet()
+        signature = [date_field, start, end] + QuerySpec.create(
+            entity, limit, with_params, filters
+        ).signature
+        # ids of objects which pending windows can return again
+        carried: set = set()
+        if checkpoint is not None:
+            state = checkpoint.load(signature)
+            if state is not None:
+                pending = [tuple(window) for window in state["pending"]]
+                carried = set(state["seen"]) if str_ids else set(IdSet.loads(state["seen"]))
+                seen.update(carried)
+        while pending:
+            args = (date_field, split, limit, with_params, filters, fields, drop_links)
+            args_list = [(entity, window) + args for window in pending]
+            results = run_concurrently(self._scan_window, args_list, workers)
+            next_pending: list = []
+            next_carried: set = set()
+            for done, (items, sub_windows) in enumerate(results, 1):
+                next_pending.extend(sub_windows)
+                for item in items:
+                    if item["id"] not in seen:
+                        seen.add(item["id"])
+                        yield item
+                    if in_windows(item.get(date_field), sub_windows):
+                        next_carried.add(item["id"])
+                if checkpoint is not None:
+                    boundary = carried | next_carried
+                    checkpoint.save(
+                        signature,
+                        pending=pending[done:] + next_pending,
+                        seen=sorted(boundary) if str_ids else IdSet(boundary).dumps(),
+                    )
+            pending = next_pending
+            carried = next_carried
+        if checkpoint is not None:
+            checkpoint.clear()
+
+    def iter_by_updated_at(
+        self,
+        entity: str,
+        updated_from: Optional[int] = None,
+        updated_to: Optional[int] = None,
+        limit: int = 250,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[dict]:
+        """Iterate over objects ordered by updated_at with moving filter[updated_at][from] cursor
+        Every request reads first page from cursor, so objects updated during iteration
+        are not skipped, they are returned again later with new updated_at.
+        Objects of cursor second which were already returned are skipped.
+        Args:
+            entity (str): leads, contacts, companies or customers
+            updated_from (Optional[int], optional): timestamp to start from. Defaults to None.
+            updated_to (Optional[int], optional): last timestamp, included. Defaults to None.
+            other params like in get_leads
+            checkpoint (Optional[Checkpoint], optional): cursor is saved after every consumed page
+                and kept after iteration, so next iteration returns only new changes. Defaults to None.
+
+        Returns:
+            Iterator[dict]: objects
+        """
+        filters = dict(filters or {})
+        if fields:
+            fields = list(fields) + ["updated_at"]
+        signature = ["updated_at", updated_to] + QuerySpec.create(
+            entity, limit, with_params, filters
+        ).signature
+        cursor = updated_from
+        boundary = IdSet()
+        if checkpoint is not None:
+            state = checkpoint.load(signature)
+            if state is not None:
+                cursor, boundary = state["cursor"], IdSet.loads(state["boundary"])
+        last: dict = {}
+        while True:
+            range_filters = dict(
+                filters, updated_at__from=cursor, updated_at__to=updated_to
+            )
+            query = QuerySpec.create(
+                entity, limit, with_params, range_filters, order={"updated_at": "asc"}
+            )
+            data = self.get_query_page(query, 1, fields, drop_links)
+            items = data.get("_embedded", {}).get(query.entity, [])
+            has_next = "next" in data.get("_links", {})
+            if has_next and items[-1]["updated_at"] == cursor:
+                # more than one page of objects updated at cursor second,
+                # pages of second are read again while they have new objects
+                range_filters["updated_at__to"] = cursor
+                query = QuerySpec.create(
+                    entity, limit, with_params, range_filters, order={"id": "asc"}
+                )
+                found = True
+                while found:
+                    found = False
+                    for item in self.iter_query(
+                        query, fields=fields, drop_links=drop_links
+                    ):
+                        if item["id"] not in boundary:
+                            boundary.add(item["id"])
+                            found = True
+                            last = item
+                            yield item
+                next_cursor, next_boundary = cursor + 1, IdSet()
+            else:
+                next_cursor = items[-1]["updated_at"] if items else cursor
+                next_boundary = IdSet(boundary if next_cursor == cursor else ())
+                for item in items:
+                    if item["id"] in boundary:
+                        continue
+                    if item["updated_at"] == next_cursor:
+                        next_boundary.add(item["id"])
+                    last = item
+                    yield item
+            cursor, boundary = next_cursor, next_boundary
+            if checkpoint is not None:
+                checkpoint.save(
+                    signature,
+                    cursor=cursor,
+                    boundary=boundary.dumps(),
+                    last_id=last.get("id"),
+                )
+            if not has_next:
+                return
 
     def _get_entity_links(
         self, entity: str, entity_id: int, filters: Optional[dict] = None
@@ -126,6 +678,56 @@ class BaseClient(object):
         url = f"{self.crm_url}/api/v4/{entity}/{entity_id}/unlinks"
         return self._send_api_request("post", url, objects)
 
+    def _bulk_link_entities(
+        self,
+        entity: str,
+        objects: list,
+        action: str,
+        max_workers: Optional[int] = None,
+    ) -> dict:
+        url = f"{self.crm_url}/api/v4/{entity}/{action}"
+        chunks = [
+            ("post", url, objects[i : i + BULK_CHUNK_SIZE])
+            for i in range(0, len(objects), BULK_CHUNK_SIZE)
+        ]
+        workers = max_workers or self.max_workers
+        links = []
+        for result in run_concurrently(self._send_api_request, chunks, workers):
+            links.extend((result or {}).get("_embedded", {}).get("links", []))
+        return {"_embedded": {"links": links}}
+
+    def link_entities_bulk(
+        self, entity: str, objects: list, max_workers: Optional[int] = None
+    ) -> dict:
+        """Link many source entities with collection /{entity}/link requests
+        Doc: https://www.amocrm.ru/developers/content/crm_platform/entity-links-api#links-link
+        Args:
+            entity (str): leads, contacts, companies or customers
+            objects (list): links like [{'entity_id': 1, 'to_entity_id': 2, 'to_entity_type': 'contacts'}],
+                split into chunks of 50 sent concurrently
+            max_workers (Optional[int], optional): concurrent requests. Defaults to client max_workers.
+
+        Returns:
+            dict: {'_embedded': {'links': [...]}} - links of all chunks
+        """
+        return self._bulk_link_entities(entity, objects, "link", max_workers)
+
+    def unlink_entities_bulk(
+        self, entity: str, objects: list, max_workers: Optional[int] = None
+    ) -> dict:
+        """Unlink many source entities with collection /{entity}/unlink requests
+        Doc: https://www.amocrm.ru/developers/content/crm_platform/entity-links-api#links-unlink
+        Args:
+            entity (str): leads, contacts, companies or customers
+            objects (list): links like [{'entity_id': 1, 'to_entity_id': 2, 'to_entity_type': 'contacts'}],
+                split into chunks of 50 sent concurrently
+            max_workers (Optional[int], optional): concurrent requests. Defaults to client max_workers.
+
+        Returns:
+            dict: {'_embedded': {'links': [...]}}
+        """
+        return self._bulk_link_entities(entity, objects, "unlink", max_workers)
+
     def unlink_leads_entity(self, entity_id: int, objects: list) -> dict:
         return self._unlink_entities("leads", entity_id, objects)
 
@@ -168,6 +770,53 @@ class BaseClient(object):
     ) -> dict:
         return self._get_entity_links("customers", entity_id, filters)
 
+    def _get_links_chunk(
+        self, entity: str, ids: list, filters: Optional[dict] = None
+    ) -> list:
+        url = f"{self.crm_url}/api/v4/{entity}/links"
+        params = [("filter[entity_id][]", id_) for id_ in ids]
+        if filters:
+            params.extend((f"filter[{k}]", v) for k, v in filters.items())
+        links: list = []
+        page = 1
+        while True:
+            query = urlencode([("page", page), ("limit", MAX_LIMIT)] + params)
+            data = self._send_api_request("get", f"{url}?{query}")
+            links.extend(data.get("_embedded", {}).get("links", []))
+            if "next" not in data.get("_links", {}):
+                return links
+            page += 1
+
+    def get_links_bulk(
+        self,
+        entity: str,
+        ids: Iterable[int],
+        filters: Optional[dict] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[int, list]:
+        """Get links of many entities with collection /{entity}/links requests
+        Doc: https://www.amocrm.ru/developers/content/crm_platform/entity-links-api#links-list
+        Args:
+            entity (str): leads, contacts, companies or customers
+            ids (Iterable[int]): ids of entities, split into chunks of 100
+            filters (Optional[dict], optional): filter params like {'to_entity_type': 'contacts'}. Defaults to None.
+            max_workers (Optional[int], optional): concurrent chunk requests. Defaults to client max_workers.
+
+        Returns:
+            Dict[int, list]: {entity id: links}, empty list if entity has no links
+        """
+        ids = list(dict.fromkeys(ids))
+        chunks = [
+            (entity, ids[i : i + LINKS_CHUNK_SIZE], filters)
+            for i in range(0, len(ids), LINKS_CHUNK_SIZE)
+        ]
+        result: Dict[int, list] = {id_: [] for id_ in ids}
+        workers = max_workers or self.max_workers
+        for links in run_concurrently(self._get_links_chunk, chunks, workers):
+            for link in links:
+                result.setdefault(link["entity_id"], []).append(link)
+        return result
+
     def get_account_info(
         self,
         with_amojo_id: bool = False,
@@ -301,28 +950,53 @@ class BaseClient(object):
         url += "?with=" + ",".join(p for p in with_params)
         return self._send_api_request("get", url)
 
+    def get_payload_validator(self, entity: str) -> PayloadValidator:
+        """Return validator of create/update objects built from cached custom fields
+        schema and, for leads, cached pipelines
+        Args:
+            entity (str): 'leads', 'contacts', 'companies' or 'customers'
+
+        Returns:
+            PayloadValidator: validator
+        """
+        schema = self.get_custom_field_schema(entity)
+        pipeline_statuses = None
+        if entity == "leads":
+            pipeline_statuses = self.get_pipeline_resolver().statuses_by_pipeline()
+        return PayloadValidator(schema, pipeline_statuses)
+
     def _create_or_update_entities(
-        self, entity: str, objects: list, update: bool = False
+        self, entity: str, objects: list, update: bool = False, validate: bool = False
     ) -> dict:
         """method for create or update entities
 
         Args:
             entity (str): name of entities like 'leads'
-            objects (list): list of obejcts
+            objects (list): list of obejcts or amocrm_api.models records
             update (bool): if True http method patch else post
+            validate (bool): check objects against cached schema before sending
+
+        Raises:
+            AmoValidationError: if validate and some objects are invalid
 
         Returns:
             dict: query result
         """
         url = f"{self.crm_url}/api/v4/{entity}"
         http_method = "patch" if update else "post"
+        objects = [o.to_payload() if isinstance(o, Model) else o for o in objects]
+        if validate:
+            errors = self.get_payload_validator(entity).validate_many(objects)
+            if errors:
+                raise AmoValidationError(errors)
         return self._send_api_request(http_method, url, objects)
 
-    def create_leads(self, objects: list) -> dict:
+    def create_leads(self, objects: list, validate: bool = False) -> dict:
         """create leads
         Doc: https://www.amocrm.ru/developers/content/crm_platform/leads-api#leads-add
         Args:
             objects (list): list of leads
+            validate (bool, optional): check objects against cached schema before sending. Defaults to False.
 
         Returns:
             dict: {
@@ -355,13 +1029,72 @@ class BaseClient(object):
                 }
             }
         """
-        return self._create_or_update_entities("leads", objects)
+        return self._create_or_update_entities(
+            "leads", objects, False, validate
+        )
+
+    def create_leads_complex(
+        self, objects: list, max_workers: Optional[int] = None
+    ) -> list:
+        """create leads with new contact and company in one request per 50 leads
+        Doc: https://www.amocrm.ru/developers/content/crm_platform/leads-api#leads-complex-add
+        Args:
+            objects (list): leads with contact and company in `_embedded` like
+                {'name': .., '_embedded': {'contacts': [{..}], 'companies': [{..}]}},
+                chunks are sent concurrently
+            max_workers (Optional[int], optional): concurrent requests. Defaults to client max_workers.
+
+        Raises:
+            ValueError: if request_id of objects is not unique
 
-    def update_leads(self, objects: list) -> dict:
+        Returns:
+            list: result of every object in order of objects, None if missing,
+                objects without request_id get unique one like '0': [
+                {
+                    "id": 10185151,
+                    "contact_id": 10185153,
+                    "company_id": 10185155,
+                    "request_id": ["0"],
+                    "merged": false
+                }
+            ]
+        """
+        url = f"{self.crm_url}/api/v4/leads/complex"
+        payload = [
+            obj.to_payload() if isinstance(obj, Model) else dict(obj)
+            for obj in objects
+        ]
+        used = [str(obj["request_id"]) for obj in payload if "request_id" in obj]
+        if len(set(used)) < len(used):
+            raise ValueError("request_id of objects must be unique")
+        taken = set(used)
+        for index, obj in enumerate(payload):
+            if "request_id" not in obj:
+                request_id = str(index)
+                while request_id in taken:
+                    request_id += "_"
+                taken.add(request_id)
+                obj["request_id"] = request_id
+        chunks = [
+            ("post", url, payload[i : i + BULK_CHUNK_SIZE])
+            for i in range(0, len(payload), BULK_CHUNK_SIZE)
+        ]
+        results: list = []
+        workers = max_workers or self.max_workers
+        for (_, _, chunk), result in zip(
+            chunks, run_concurrently(self._send_api_request, chunks, workers)
+        ):
+            # results of chunk are in order of its objects
+            items = list(result or ())
+            results.extend(items[:len(chunk)] + [None] * (len(chunk) - len(items)))
+        return results
+
+    def update_leads(self, objects: list, validate: bool = False) -> dict:
         """update leads
         Doc: https://www.amocrm.ru/developers/content/crm_platform/leads-api#leads-edit
         Args:
             objects (list): list of leads
+            validate (bool, optional): check objects against cached schema before sending. Defaults to False.
         Returns:
             dict: {
                 "_links": {
@@ -395,13 +1128,19 @@ class BaseClient(object):
                 }
             }
         """
-        return self._create_or_update_entities("leads", objects, True)
+        return self._create_or_update_entities(
+            "leads", objects, True, validate
+        )
 
-    def get_lead(self, lead_id: int) -> dict:
+    def get_lead(
+        self, lead_id: int, fields: Optional[list] = None, drop_links: bool = False
+    ) -> dict:
         """return lead
         Doc: https://www.amocrm.ru/developers/content/crm_platform/leads-api#lead-detail
         Args:
             lead_id (int): id of lead
+            fields (Optional[list], optional): keep only these keys. Defaults to None.
+            drop_links (bool, optional): drop `_links`. Defaults to False.
 
         Returns:
             dict: {
@@ -485,7 +1224,8 @@ class BaseClient(object):
             }
         """
         url = f"{self.crm_url}/api/v4/leads/{lead_id}"
-        return self._send_api_request("get", url)
+        projection = Projection.create(fields, drop_links)
+        return self._send_api_request("get", url, projection=projection)
 
     def get_leads(
         self,
@@ -495,19 +1235,26 @@ class BaseClient(object):
         filters: Optional[dict] = None,
         filter_ids: Optional[list] = None,
         order: Optional[dict] = None,
-    ) -> dict:
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        lazy: bool = False,
+    ) -> Union[dict, LazyPage]:
         """Get leads
         Doc: https://www.amocrm.ru/developers/content/crm_platform/leads-api#leads-list
         Args:
-            limit (int, optional): limit of rows. Defaults to 250.
+            limit (int, optional): limit of rows, 1..250 (ValueError otherwise). Defaults to 250.
             page (int, optional): number of page. Defaults to 1.
             with_params (Optional[list], optional): params. Defaults to None.
             filters (Optional[dict], optional): filter params like {'[updated_at][from]': '<timestamp>'}. Defaults to None.
-            filter_ids (Optional[list], optional): filter ids like [1,2,2310]. Defaults to None.
+            filter_ids (Optional[list], optional): filter ids like [1,2,2310], long lists are
+                split into chunks fetched concurrently. Defaults to None.
             order (Optional[dict], optional): order params like {'update_at': 'asc'}. Defaults to None.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            lazy (bool, optional): return LazyPage of LazyRecord views. Defaults to False.
 
         Returns:
-            dict: {
+            Union[dict, LazyPage]: LazyPage if lazy, otherwise {
             "_page": 2,
             "_links": {
                 "self": {
@@ -592,6 +1339,67 @@ class BaseClient(object):
         params: dict = {k: v for k, v in locals().items() if k != "self"}
         return self._get_entities("leads", **params)
 
+    def iter_leads(
+        self,
+        limit: int = 250,
+        page: int = 1,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+        order: Optional[dict] = None,
+        stream: bool = False,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        model: bool = False,
+        lazy: bool = False,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[Any]:
+        """Iterate over leads of all pages
+        Args:
+            params like in get_leads
+            stream (bool, optional): yield leads while page is being read. Defaults to False.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            model (bool, optional): yield compact records from amocrm_api.models. Defaults to False.
+            lazy (bool, optional): yield LazyRecord views from amocrm_api.models. Defaults to False.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume iteration. Defaults to None.
+
+        Returns:
+            Iterator[Any]: leads
+        """
+        params: dict = {k: v for k, v in locals().items() if k != "self"}
+        return self._iter_entities("leads", **params)
+
+    def scan_leads(
+        self,
+        start: int,
+        end: int,
+        date_field: str = "updated_at",
+        windows: Optional[int] = None,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        max_workers: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[dict]:
+        """Scan leads of [start, end] range by time windows read concurrently
+        Dense windows are split again, leads are deduplicated by id, order is not kept.
+        Args:
+            start (int): timestamp from, included
+            end (int): timestamp to, included
+            date_field (str, optional): updated_at or created_at. Defaults to "updated_at".
+            windows (Optional[int], optional): number of first windows. Defaults to max_workers.
+            other params like in get_leads
+            max_workers (Optional[int], optional): concurrent requests. Defaults to client max_workers.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume scan. Defaults to None.
+
+        Returns:
+            Iterator[dict]: leads
+        """
+        params: dict = {k: v for k, v in locals().items() if k != "self"}
+        return self._scan_entities("leads", **params)
+
     def get_unsorted_leads(
         self,
         page: int = 1,
@@ -605,7 +1413,7 @@ class BaseClient(object):
         Doc: https://www.amocrm.ru/developers/content/crm_platform/unsorted-api#unsorted-list
         Args:
             page (int, optional): number of page. Defaults to 1.
-            limit (int, optional): limit rows. Defaults to 250.
+            limit (int, optional): limit rows, 1..250 (ValueError otherwise). Defaults to 250.
             filter_by_uids (Union[str, list, None], optional): filter by uids, values str or list. Defaults to None.
             filter_by_pipeline_id (Union[str, list, None], optional): filter by pipelines. Defaults to None.
             filter_by_category (Union[str, list, None], optional): filter by category(sip, mail, forms, chats). Defaults to None.
@@ -670,21 +1478,18 @@ class BaseClient(object):
                 }
             }
         """
-        url = f"{self.crm_url}/api/v4/leads/unsorted"
-        params: dict = {"limit": limit, "page": page}
-        orders = {}
-        if filter_by_uids:
-            params["filter[uid]"] = filter_by_uids  # type: ignore
-        if filter_by_category:
-            params["filter[category]"] = filter_by_category  # type: ignore
-        if filter_by_pipeline_id:
-            params["filter[pipeline_id]"] = filter_by_pipeline_id  # type: ignore
-        if order_by:
-            orders = {f"order[{key}]": value for key, value in order_by.items()}
-        url = f"{url}?{urlencode(params)}"
-        if orders:
-            url = f"{url}&{urlencode(orders)}"
-        return self._send_api_request("get", url)
+        filters = {
+            "uid": filter_by_uids,
+            "category": filter_by_category,
+            "pipeline_id": filter_by_pipeline_id,
+        }
+        query = QuerySpec.create(
+            "leads/unsorted",
+            limit,
+            filters={k: v for k, v in filters.items() if v},
+            order=order_by,
+        )
+        return self._send_api_request("get", query.url(self.crm_url, page))
 
     def get_unsorted_by_uid(self, uid: str) -> dict:
         """Get unsorted obj by uid
@@ -1027,6 +1832,21 @@ class BaseClient(object):
         url = f"{self.crm_url}/api/v4/leads/unsorted/summary?{urlencode(params)}"
         return self._send_api_request("get", url)
 
+    def get_pipeline_resolver(self, refresh: bool = False) -> PipelineResolver:
+        """Return cached pipelines/statuses resolver built from one get_pipelines request,
+        it is rebuilt after pipeline and status write methods
+        Args:
+            refresh (bool, optional): reload pipelines. Defaults to False.
+
+        Returns:
+            PipelineResolver: resolver
+        """
+        if refresh or self._pipeline_resolver is None:
+            data = self.get_pipelines()
+            pipelines = data.get("_embedded", {}).get("pipelines", [])
+            self._pipeline_resolver = PipelineResolver(pipelines)
+        return self._pipeline_resolver
+
     def get_pipelines(self) -> dict:
         """get leads pipelines
 
@@ -1273,7 +2093,9 @@ class BaseClient(object):
         }
         if request_id:
             params["request_id"] = request_id
-        return self._send_api_request("post", url, [params])
+        result = self._send_api_request("post", url, [params])
+        self._pipeline_resolver = None
+        return result
 
     def edit_pipeline(
         self,
@@ -1302,7 +2124,9 @@ class BaseClient(object):
             "is_main": is_main,
             "is_unsorted_on": is_unsorted_on,
         }
-        return self._send_api_request("patch", url, params)
+        result = self._send_api_request("patch", url, params)
+        self._pipeline_resolver = None
+        return result
 
     def delete_pipeline(self, pipeline_id: int) -> dict:
         """Delete pipeline
@@ -1314,7 +2138,9 @@ class BaseClient(object):
             dict: query result
         """
         url = f"{self.crm_url}/api/v4/leads/pipelines/{pipeline_id}"
-        return self._send_api_request("delete", url)
+        result = self._send_api_request("delete", url)
+        self._pipeline_resolver = None
+        return result
 
     def get_pipeline_statuses(self, pipeline_id: int) -> dict:
         """return pipeline Statuses
@@ -1509,7 +2335,9 @@ class BaseClient(object):
             }
         """
         url = f"{self.crm_url}/api/v4/leads/pipelines/{pipeline_id}/statuses"
-        return self._send_api_request("post", url, statuses)
+        result = self._send_api_request("post", url, statuses)
+        self._pipeline_resolver = None
+        return result
 
     def edit_pipeline_status(
         self, pipeline_id: int, status_id: int, name: str, sort: int, color: str
@@ -1545,7 +2373,9 @@ class BaseClient(object):
             f"{self.crm_url}/api/v4/leads/pipelines/{pipeline_id}/statuses/{status_id}"
         )
         params = {"name": name, "sort": sort, "color": color}
-        return self._send_api_request("patch", url, params)
+        result = self._send_api_request("patch", url, params)
+        self._pipeline_resolver = None
+        return result
 
     def delete_status_from_pipeline(self, pipeline_id: int, status_id: int) -> dict:
         """Delete status from pipeline
@@ -1560,7 +2390,9 @@ class BaseClient(object):
         url = (
             f"{self.crm_url}/api/v4/leads/pipelines/{pipeline_id}/statuses/{status_id}"
         )
-        return self._send_api_request("delete", url)
+        result = self._send_api_request("delete", url)
+        self._pipeline_resolver = None
+        return result
 
     def get_contacts(
         self,
@@ -1569,17 +2401,26 @@ class BaseClient(object):
         with_params: Optional[list] = None,
         filters: Optional[dict] = None,
         order: Optional[dict] = None,
-    ) -> dict:
+        filter_ids: Optional[list] = None,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        lazy: bool = False,
+    ) -> Union[dict, LazyPage]:
         """Get contacts
         Doc: https://www.amocrm.ru/developers/content/crm_platform/contacts-api#contacts-list
         Args:
-            limit (int, optional): limit of rows. Defaults to 250.
+            limit (int, optional): limit of rows, 1..250 (ValueError otherwise). Defaults to 250.
             page (int, optional): number of page. Defaults to 1.
             with_params (Optional[list], optional): params. Defaults to None.
             filters (Optional[dict], optional): filter params like {'[updated_at][from]': '<timestamp>'}. Defaults to None.
             order (Optional[dict], optional): filter params like {'updated_at': 'asc'}. Defaults to None.
+            filter_ids (Optional[list], optional): filter ids like [1,2,2310], long lists are
+                split into chunks fetched concurrently. Defaults to None.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            lazy (bool, optional): return LazyPage of LazyRecord views. Defaults to False.
         Returns:
-            dict:{
+            Union[dict, LazyPage]: LazyPage if lazy, otherwise {
                 "_page": 1,
                 "_links": {
                     "self": {
@@ -1646,11 +2487,76 @@ class BaseClient(object):
         params = {k: v for k, v in locals().items() if k != "self"}
         return self._get_entities("contacts", **params)
 
-    def get_contact(self, contact_id: int) -> dict:
+    def iter_contacts(
+        self,
+        limit: int = 250,
+        page: int = 1,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        order: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+        stream: bool = False,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        model: bool = False,
+        lazy: bool = False,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[Any]:
+        """Iterate over contacts of all pages
+        Args:
+            params like in get_contacts
+            stream (bool, optional): yield contacts while page is being read. Defaults to False.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            model (bool, optional): yield compact records from amocrm_api.models. Defaults to False.
+            lazy (bool, optional): yield LazyRecord views from amocrm_api.models. Defaults to False.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume iteration. Defaults to None.
+
+        Returns:
+            Iterator[Any]: contacts
+        """
+        params = {k: v for k, v in locals().items() if k != "self"}
+        return self._iter_entities("contacts", **params)
+
+    def scan_contacts(
+        self,
+        start: int,
+        end: int,
+        date_field: str = "updated_at",
+        windows: Optional[int] = None,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        max_workers: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[dict]:
+        """Scan contacts of [start, end] range by time windows read concurrently
+        Dense windows are split again, contacts are deduplicated by id, order is not kept.
+        Args:
+            start (int): timestamp from, included
+            end (int): timestamp to, included
+            date_field (str, optional): updated_at or created_at. Defaults to "updated_at".
+            windows (Optional[int], optional): number of first windows. Defaults to max_workers.
+            other params like in get_contacts
+            max_workers (Optional[int], optional): concurrent requests. Defaults to client max_workers.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume scan. Defaults to None.
+
+        Returns:
+            Iterator[dict]: contacts
+        """
+        params: dict = {k: v for k, v in locals().items() if k != "self"}
+        return self._scan_entities("contacts", **params)
+
+    def get_contact(
+        self, contact_id: int, fields: Optional[list] = None, drop_links: bool = False
+    ) -> dict:
         """Get contact
         Doc: https://www.amocrm.ru/developers/content/crm_platform/contacts-api#contact-detail
         Args:
             contact_id (int): id of contact
+            fields (Optional[list], optional): keep only these keys. Defaults to None.
+            drop_links (bool, optional): drop `_links`. Defaults to False.
 
         Returns:
             dict: {
@@ -1731,13 +2637,15 @@ class BaseClient(object):
             }
         """
         url = f"{self.crm_url}/api/v4/contacts/{contact_id}"
-        return self._send_api_request("get", url)
+        projection = Projection.create(fields, drop_links)
+        return self._send_api_request("get", url, projection=projection)
 
-    def create_contacts(self, contacts: list) -> dict:
+    def create_contacts(self, contacts: list, validate: bool = False) -> dict:
         """Create contacts
         Doc: https://www.amocrm.ru/developers/content/crm_platform/contacts-api#contacts-add
         Args:
             contacts (list): list of contacts objects
+            validate (bool, optional): check objects against cached schema before sending. Defaults to False.
 
         Returns:
             dict: {
@@ -1769,13 +2677,16 @@ class BaseClient(object):
                 }
             }
         """
-        return self._create_or_update_entities("contacts", contacts)
+        return self._create_or_update_entities(
+            "contacts", contacts, False, validate
+        )
 
-    def update_contacts(self, contacts: list) -> dict:
+    def update_contacts(self, contacts: list, validate: bool = False) -> dict:
         """Update contacts
 
         Args:
             contacts (list): list of contacts object
+            validate (bool, optional): check objects against cached schema before sending. Defaults to False.
 
         Returns:
             dict: {
@@ -1800,8 +2711,9 @@ class BaseClient(object):
                 }
             }
         """
-        url = f"{self.crm_url}/api/v4/contacts"
-        return self._create_or_update_entities("contacts", contacts, True)
+        return self._create_or_update_entities(
+            "contacts", contacts, True, validate
+        )
 
     def get_companies(
         self,
@@ -1810,18 +2722,27 @@ class BaseClient(object):
         with_params: Optional[list] = None,
         filters: Optional[dict] = None,
         order: Optional[dict] = None,
-    ) -> dict:
+        filter_ids: Optional[list] = None,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        lazy: bool = False,
+    ) -> Union[dict, LazyPage]:
         """Get companies
         Doc: https://www.amocrm.ru/developers/content/crm_platform/companies-api#companies-list
         Args:
-            limit (int, optional): limit of page. Defaults to 250.
+            limit (int, optional): limit of page, 1..250 (ValueError otherwise). Defaults to 250.
             page (int, optional): page index. Defaults to 1.
             with_params (Optional[list], optional): with params(check dock). Defaults to None.
             filters (Optional[dict], optional): dict filters like({'[updated_at][from]: "<timestamp>"'}). Defaults to None.
             order (Optional[dict], optional): dict like - {'updated_at': 'asc'}. Defaults to None.
+            filter_ids (Optional[list], optional): filter ids like [1,2,2310], long lists are
+                split into chunks fetched concurrently. Defaults to None.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            lazy (bool, optional): return LazyPage of LazyRecord views. Defaults to False.
 
         Returns:
-            dict: {
+            Union[dict, LazyPage]: LazyPage if lazy, otherwise {
                 "_page": 1,
                 "_links": {
                     "self": {
@@ -1882,11 +2803,132 @@ class BaseClient(object):
         params = {k: v for k, v in locals().items() if k != "self"}
         return self._get_entities("companies", **params)
 
-    def get_company(self, company_id: int) -> dict:
+    def iter_companies(
+        self,
+        limit: int = 250,
+        page: int = 1,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        order: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+        stream: bool = False,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        model: bool = False,
+        lazy: bool = False,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[Any]:
+        """Iterate over companies of all pages
+        Args:
+            params like in get_companies
+            stream (bool, optional): yield companies while page is being read. Defaults to False.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            model (bool, optional): yield compact records from amocrm_api.models. Defaults to False.
+            lazy (bool, optional): yield LazyRecord views from amocrm_api.models. Defaults to False.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume iteration. Defaults to None.
+
+        Returns:
+            Iterator[Any]: companies
+        """
+        params = {k: v for k, v in locals().items() if k != "self"}
+        return self._iter_entities("companies", **params)
+
+    def scan_companies(
+        self,
+        start: int,
+        end: int,
+        date_field: str = "updated_at",
+        windows: Optional[int] = None,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        max_workers: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[dict]:
+        """Scan companies of [start, end] range by time windows read concurrently
+        Dense windows are split again, companies are deduplicated by id, order is not kept.
+        Args:
+            start (int): timestamp from, included
+            end (int): timestamp to, included
+            date_field (str, optional): updated_at or created_at. Defaults to "updated_at".
+            windows (Optional[int], optional): number of first windows. Defaults to max_workers.
+            other params like in get_companies
+            max_workers (Optional[int], optional): concurrent requests. Defaults to client max_workers.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume scan. Defaults to None.
+
+        Returns:
+            Iterator[dict]: companies
+        """
+        params: dict = {k: v for k, v in locals().items() if k != "self"}
+        return self._scan_entities("companies", **params)
+
+    def _get_entities_by_ids(
+        self, entity: str, ids: Iterable[int], with_params: Optional[list] = None
+    ) -> Dict[int, dict]:
+        """return {id: object} fetched by filter[id] list requests, ids are deduplicated"""
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return {}
+        data = self._get_entities_by_id_chunks(
+            entity, MAX_LIMIT, with_params, None, split_filter_ids(ids), None
+        )
+        return {item["id"]: item for item in data["_embedded"][entity]}
+
+    def hydrate_leads(
+        self, leads: list, contacts: bool = True, companies: bool = True
+    ) -> list:
+        """Replace contacts and companies stubs in `_embedded` of leads with full objects
+        Leads must be fetched with with_params=['contacts'] to have contacts stubs.
+        All referenced ids of the batch are fetched with filter[id] list requests,
+        companies of hydrated contacts are hydrated too.
+        Args:
+            leads (list): leads objects, changed in place
+            contacts (bool, optional): hydrate contacts. Defaults to True.
+            companies (bool, optional): hydrate companies. Defaults to True.
+
+        Returns:
+            list: leads
+        """
+        contact_stubs = []
+        company_stubs = []
+        for lead in leads:
+            embedded = lead.get("_embedded") or {}
+            if contacts:
+                contact_stubs.extend(embedded.get("contacts") or ())
+            if companies:
+                company_stubs.extend(embedded.get("companies") or ())
+        if contact_stubs:
+            found = self._get_entities_by_ids(
+                "contacts", (stub["id"] for stub in contact_stubs)
+            )
+            for stub in contact_stubs:
+                contact = found.get(stub["id"])
+                if contact is not None:
+                    stub.update(contact)
+                    if companies:
+                        embedded = contact.get("_embedded") or {}
+                        company_stubs.extend(embedded.get("companies") or ())
+        if company_stubs:
+            found = self._get_entities_by_ids(
+                "companies", (stub["id"] for stub in company_stubs)
+            )
+            for stub in company_stubs:
+                company = found.get(stub["id"])
+                if company is not None:
+                    stub.update(company)
+        return leads
+
+    def get_company(
+        self, company_id: int, fields: Optional[list] = None, drop_links: bool = False
+    ) -> dict:
         """Get company
         Doc: https://www.amocrm.ru/developers/content/crm_platform/companies-api#company-detail
         Args:
             company_id (int): id of company
+            fields (Optional[list], optional): keep only these keys. Defaults to None.
+            drop_links (bool, optional): drop `_links`. Defaults to False.
 
         Returns:
             dict: {
@@ -1926,13 +2968,15 @@ class BaseClient(object):
             }
         """
         url = f"{self.crm_url}/api/v4/companies/{company_id}"
-        return self._send_api_request("get", url)
+        projection = Projection.create(fields, drop_links)
+        return self._send_api_request("get", url, projection=projection)
 
-    def create_companies(self, companies: list) -> dict:
+    def create_companies(self, companies: list, validate: bool = False) -> dict:
         """Create companies
         Doc: https://www.amocrm.ru/developers/content/crm_platform/companies-api#companies-add
         Args:
             companies (list): list of companies
+            validate (bool, optional): check objects against cached schema before sending. Defaults to False.
 
         Returns:
             dict: {
@@ -1956,14 +3000,16 @@ class BaseClient(object):
                 }
             }
         """
-        url = f"{self.crm_url}/api/v4/companies"
-        return self._send_api_request("post", url, companies)
+        return self._create_or_update_entities(
+            "companies", companies, False, validate
+        )
 
-    def update_companies(self, companies: list) -> dict:
+    def update_companies(self, companies: list, validate: bool = False) -> dict:
         """Update companies
 
         Args:
             companies (list): list of companies
+            validate (bool, optional): check objects against cached schema before sending. Defaults to False.
 
         Returns:
             dict: {
@@ -1988,18 +3034,22 @@ class BaseClient(object):
                 }
             }
         """
-        url = f"{self.crm_url}/api/v4/companies"
-        return self._send_api_request("post", url, companies)
+        return self._create_or_update_entities(
+            "companies", companies, True, validate
+        )
 
-    def get_catalogs(self, page: int = 1, limit: int = 250) -> dict:
+    def get_catalogs(
+        self, page: int = 1, limit: int = 250, lazy: bool = False
+    ) -> Union[dict, LazyPage]:
         """Get catalogs
         Doc: https://www.amocrm.ru/developers/content/crm_platform/catalogs-api#lists-list
         Args:
             page (int, optional): page number. Defaults to 1.
-            limit (int, optional): limit of page result. Defaults to 250.
+            limit (int, optional): limit of page result, 1..250 (ValueError otherwise). Defaults to 250.
+            lazy (bool, optional): return LazyPage of LazyRecord views. Defaults to False.
 
         Returns:
-            dict: {
+            Union[dict, LazyPage]: LazyPage if lazy, otherwise {
                 "_page": 1,
                 "_links": {
                     "self": {
@@ -2078,7 +3128,7 @@ class BaseClient(object):
                 }
             }
         """
-        params: dict = {"page": page, "limit": limit}
+        params: dict = {"page": page, "limit": limit, "lazy": lazy}
         return self._get_entities("catalogs", **params)
 
     def get_catalog(self, catalog_id: int) -> dict:
@@ -2192,17 +3242,19 @@ class BaseClient(object):
         page: int = 1,
         limit: int = 250,
         filters: Optional[dict] = None,
-    ) -> dict:
+        lazy: bool = False,
+    ) -> Union[dict, LazyPage]:
         """Get elements by catalog id
         Doc: https://www.amocrm.ru/developers/content/crm_platform/catalogs-api#list-elements-list
         Args:
             catalog_id (int): id of catalog
             page (int, optional): number of page. Defaults to 1.
-            limit (int, optional): limit rows. Defaults to 250.
+            limit (int, optional): limit rows, 1..250 (ValueError otherwise). Defaults to 250.
             filters (Optional[dict], optional): filter dict. Defaults to None.
+            lazy (bool, optional): return LazyPage of LazyRecord views. Defaults to False.
 
         Returns:
-            dict: {
+            Union[dict, LazyPage]: LazyPage if lazy, otherwise {
                 "_page": 1,
                 "_links": {
                     "self": {
@@ -2281,7 +3333,7 @@ class BaseClient(object):
                 }
             }
         """
-        params: dict = {"page": page, "limit": limit, "filters": filters}
+        params: dict = {"page": page, "limit": limit, "filters": filters, "lazy": lazy}
         entity = f"catalogs/{catalog_id}/elements"
         return self._get_entities(entity, **params)
 
@@ -2480,6 +3532,32 @@ class BaseClient(object):
             url = f"{url}?page={page}"
         return self._send_api_request("get", url)
 
+    def _get_all_custom_fields(self, entity: str) -> list:
+        custom_fields: list = []
+        page = 1
+        while True:
+            data = self._get_custom_fields(entity, page=page)
+            custom_fields.extend(data.get("_embedded", {}).get("custom_fields", []))
+            if "next" not in data.get("_links", {}):
+                return custom_fields
+            page += 1
+
+    def get_custom_field_schema(
+        self, entity: str, refresh: bool = False
+    ) -> CustomFieldSchema:
+        """Return cached custom fields schema of entity type
+        Args:
+            entity (str): entity type like 'leads', 'contacts', 'companies', 'customers'
+            refresh (bool, optional): reload all pages of custom fields. Defaults to False.
+
+        Returns:
+            CustomFieldSchema: fields indexed by id, code and name
+        """
+        if refresh or entity not in self._custom_field_schemas:
+            custom_fields = self._get_all_custom_fields(entity)
+            self._custom_field_schemas[entity] = CustomFieldSchema(entity, custom_fields)
+        return self._custom_field_schemas[entity]
+
     def get_contacts_custom_fields(self, page: Optional[int] = None) -> dict:
         return self._get_custom_fields("contacts", page=page)
 
@@ -2678,6 +3756,31 @@ class BaseClient(object):
             url = f"{url}&with={with_str}"
         return self._send_api_request("get", url)
 
+    def _get_all_users(self, with_role: bool = False, with_group: bool = False) -> list:
+        users: list = []
+        page = 1
+        while True:
+            data = self.get_users(page, 250, with_role, with_group)
+            users.extend(data.get("_embedded", {}).get("users", []))
+            if "next" not in data.get("_links", {}):
+                return users
+            page += 1
+
+    def get_user_directory(self, ttl: float = 3600) -> UserDirectory:
+        """Return cached directory of all users with roles and groups
+        Args:
+            ttl (float, optional): seconds before users are reloaded. Defaults to 3600.
+
+        Returns:
+            UserDirectory: users indexed by id, email and group
+        """
+        if self._user_directory is None:
+            self._user_directory = UserDirectory(
+                lambda: self._get_all_users(with_role=True, with_group=True), ttl
+            )
+        self._user_directory.ttl = ttl
+        return self._user_directory
+
     def get_user(
         self,
         user_id: int,
@@ -3058,17 +4161,23 @@ class BaseClient(object):
         limit: int = 250,
         filters: Optional[dict] = None,
         order: Optional[dict] = None,
-    ) -> dict:
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        lazy: bool = False,
+    ) -> Union[dict, LazyPage]:
         """Get tasks
         Doc: https://www.amocrm.ru/developers/content/crm_platform/tasks-api#tasks-list
         Args:
             page (int, optional): number of page. Defaults to 1.
-            limit (int, optional): limit row. Defaults to 250.
+            limit (int, optional): limit row, 1..250 (ValueError otherwise). Defaults to 250.
             filters (Optional[dict], optional): {'[updated_at][from]': <timestamp>}. Defaults to None.
             order (Optional[dict], optional): {'updated_at': <timestamp>}. Defaults to None.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            lazy (bool, optional): return LazyPage of LazyRecord views. Defaults to False.
 
         Returns:
-            dict: {
+            Union[dict, LazyPage]: LazyPage if lazy, otherwise {
                 "_page": 1,
                 "_links": {
                     "self": {
@@ -3133,11 +4242,74 @@ class BaseClient(object):
         params = {k: v for k, v in locals().items() if k != "self"}
         return self._get_entities("tasks", **params)
 
-    def get_task(self, task_id: int) -> dict:
+    def iter_tasks(
+        self,
+        page: int = 1,
+        limit: int = 250,
+        filters: Optional[dict] = None,
+        order: Optional[dict] = None,
+        stream: bool = False,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        model: bool = False,
+        lazy: bool = False,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[Any]:
+        """Iterate over tasks of all pages
+        Args:
+            params like in get_tasks
+            stream (bool, optional): yield tasks while page is being read. Defaults to False.
+            fields (Optional[list], optional): keep only these keys of objects. Defaults to None.
+            drop_links (bool, optional): drop `_links` of objects. Defaults to False.
+            model (bool, optional): yield compact records from amocrm_api.models. Defaults to False.
+            lazy (bool, optional): yield LazyRecord views from amocrm_api.models. Defaults to False.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume iteration. Defaults to None.
+
+        Returns:
+            Iterator[Any]: tasks
+        """
+        params = {k: v for k, v in locals().items() if k != "self"}
+        return self._iter_entities("tasks", **params)
+
+    def scan_tasks(
+        self,
+        start: int,
+        end: int,
+        date_field: str = "updated_at",
+        windows: Optional[int] = None,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        max_workers: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[dict]:
+        """Scan tasks of [start, end] range by time windows read concurrently
+        Dense windows are split again, tasks are deduplicated by id, order is not kept.
+        Args:
+            start (int): timestamp from, included
+            end (int): timestamp to, included
+            date_field (str, optional): updated_at or created_at. Defaults to "updated_at".
+            windows (Optional[int], optional): number of first windows. Defaults to max_workers.
+            other params like in get_tasks
+            max_workers (Optional[int], optional): concurrent requests. Defaults to client max_workers.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume scan. Defaults to None.
+
+        Returns:
+            Iterator[dict]: tasks
+        """
+        params: dict = {k: v for k, v in locals().items() if k != "self"}
+        return self._scan_entities("tasks", **params)
+
+    def get_task(
+        self, task_id: int, fields: Optional[list] = None, drop_links: bool = False
+    ) -> dict:
         """Get task
         Doc: https://www.amocrm.ru/developers/content/crm_platform/tasks-api#task-detail
         Args:
             task_id (int): id of task
+            fields (Optional[list], optional): keep only these keys. Defaults to None.
+            drop_links (bool, optional): drop `_links`. Defaults to False.
 
         Returns:
             dict: {
@@ -3167,7 +4339,8 @@ class BaseClient(object):
             }
         """
         url = f"{self.crm_url}/api/v4/tasks/{task_id}"
-        return self._send_api_request("get", url)
+        projection = Projection.create(fields, drop_links)
+        return self._send_api_request("get", url, projection=projection)
 
     def add_tasks(self, tasks: list) -> dict:
         """Add tasks
@@ -3277,17 +4450,19 @@ class BaseClient(object):
         page: int = 1,
         limit: int = 250,
         filters: Optional[dict] = None,
-    ) -> dict:
+        lazy: bool = False,
+    ) -> Union[dict, LazyPage]:
         """Get tags by entity_type
         Doc: https://www.amocrm.ru/developers/content/crm_platform/tags-api#tags-list
         Args:
             entity_type (str): leads|contacts|companies|customers
             page (int, optional): page number. Defaults to 1.
-            limit (int, optional): limit of rows. Defaults to 250.
+            limit (int, optional): limit of rows, 1..250 (ValueError otherwise). Defaults to 250.
             filters (Optional[dict], optional): {'[name]': <name>}. Defaults to None.
+            lazy (bool, optional): return LazyPage of LazyRecord views. Defaults to False.
 
         Returns:
-            dict: {
+            Union[dict, LazyPage]: LazyPage if lazy, otherwise {
                 "_page": 1,
                 "_links": {
                     "self": {
@@ -3311,7 +4486,7 @@ class BaseClient(object):
                 }
             }
         """
-        params: dict = {"page": page, "limit": limit, "filters": filters}
+        params: dict = {"page": page, "limit": limit, "filters": filters, "lazy": lazy}
         return self._get_entities(f"{entity_type}/tags", **params)
 
     def add_tags_for_entity_type(self, entity_type: str, tags: list) -> dict:
@@ -3347,6 +4522,27 @@ class BaseClient(object):
         """
         return self._create_or_update_entities(f"{entity_type}/tags", tags)
 
+    def get_tag_registry(self, entity_type: str) -> TagRegistry:
+        """Return cached tags of entity type indexed by name, all pages are loaded once
+        Args:
+            entity_type (str): leads, contacts, companies or customers
+
+        Returns:
+            TagRegistry: registry with get_or_create_many(names)
+        """
+        if entity_type not in self._tag_registries:
+
+            def create_tags(tags: list) -> list:
+                result = self.add_tags_for_entity_type(entity_type, tags)
+                return result.get("_embedded", {}).get("tags", [])
+
+            self._tag_registries[entity_type] = TagRegistry(
+                entity_type,
+                lambda: self._iter_entities(f"{entity_type}/tags"),
+                create_tags,
+            )
+        return self._tag_registries[entity_type]
+
     def _get_custom_field_by_entity_type(
         self, entity_type: str, custom_field_id: int
     ) -> dict:
@@ -3486,7 +4682,9 @@ class BaseClient(object):
         }
         """
         url = f"{self.crm_url}/api/v4/{entity_type}/custom_fields"
-        return self._send_api_request("post", url, custom_fields)
+        result = self._send_api_request("post", url, custom_fields)
+        self._custom_field_schemas.pop(entity_type, None)
+        return result
 
     def create_leads_custom_fields(self, custom_fields: list) -> dict:
         return self._create_custom_fields("leads", custom_fields)
@@ -3559,7 +4757,9 @@ class BaseClient(object):
         }
         """
         url = f"{self.crm_url}/api/v4/{entity_type}/custom_fields"
-        return self._send_api_request("patch", url, custom_fields)
+        result = self._send_api_request("patch", url, custom_fields)
+        self._custom_field_schemas.pop(entity_type, None)
+        return result
 
     def update_leads_custom_fields(self, custom_fields: list) -> dict:
         return self._update_custom_fields("leads", custom_fields)
@@ -3637,7 +4837,7 @@ class BaseClient(object):
         Doc: https://www.amocrm.ru/developers/content/crm_platform/events-and-notes#events-list
         Args:
             page (int, optional): page number. Defaults to 1.
-            limit (int, optional): limit per page. Defaults to 250.
+            limit (int, optional): limit per page, 1..250 (ValueError otherwise). Defaults to 250.
             with_params (Optional[list], optional): with params in doc. Defaults to None.
             filter_by_ids (Union[str, list, None], optional): ids filter. Defaults to None.
             filter_by_created_from (Union[str, list, None], optional): createdfrom. Defaults to None.
@@ -3696,27 +4896,112 @@ class BaseClient(object):
                 }
             }
         """
-        url = f"{self.crm_url}/api/v4/events"
-        params: dict = {"limit": limit, "page": page}
-        if with_params:
-            params["with"] = ",".join(param for param in with_params)  # type: ignore
-        if filter_by_ids:
-            params["filter[id]"] = filter_by_ids  # type: ignore
-        if filter_by_created_from:
-            params["filter[created_at][from]"] = filter_by_created_from  # type: ignore
-        if filter_by_created_to:
-            params["filter[created_at][to]"] = filter_by_created_to  # type: ignore
-        if filter_by_created_by:
-            params["filter[created_by][]"] = filter_by_created_by  # type: ignore
-        if filter_by_entity:
-            params["filter[entity][]"] = filter_by_entity  # type: ignore
-        if filter_by_entity_id:
-            params["filter[entity_id][]"] = filter_by_entity_id  # type: ignore
-        if filter_by_type:
-            params["filter[type]"] = filter_by_type  # type: ignore
+        params = [
+            ("with", ",".join(with_params or ())),
+            ("filter[id]", filter_by_ids),
+            ("filter[created_at][from]", filter_by_created_from),
+            ("filter[created_at][to]", filter_by_created_to),
+            ("filter[created_by][]", filter_by_created_by),
+            ("filter[entity][]", filter_by_entity),
+            ("filter[entity_id][]", filter_by_entity_id),
+            ("filter[type]", filter_by_type),
+        ]
+        query = QuerySpec("events", [(k, v) for k, v in params if v], limit)
+        return self._send_api_request("get", query.url(self.crm_url, page))
+
+    def scan_events(
+        self,
+        start: int,
+        end: int,
+        windows: Optional[int] = None,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        max_workers: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> Iterator[dict]:
+        """Scan events created in [start, end] range by time windows read concurrently
+        Dense windows are split again, events are deduplicated by id, order is not kept.
+        Args:
+            start (int): timestamp from, included
+            end (int): timestamp to, included
+            windows (Optional[int], optional): number of first windows. Defaults to max_workers.
+            with_params (Optional[list], optional): with params in doc. Defaults to None.
+            filters (Optional[dict], optional): filter params like {'type': 'lead_added', 'entity': 'lead'}. Defaults to None.
+            max_workers (Optional[int], optional): concurrent requests. Defaults to client max_workers.
+            checkpoint (Optional[Checkpoint], optional): saved position to resume scan. Defaults to None.
 
-        url = f"{url}?{urlencode(params)}"
-        return self._send_api_request("get", url)
+        Returns:
+            Iterator[dict]: events
+        """
+        return self._scan_entities(
+            "events",
+            start,
+            end,
+            date_field="created_at",
+            windows=windows,
+            limit=100,
+            with_params=with_params,
+            filters=filters,
+            max_workers=max_workers,
+            checkpoint=checkpoint,
+        )
+
+    def iter_events(
+        self,
+        created_from: Optional[int] = None,
+        created_to: Optional[int] = None,
+        types: Optional[list] = None,
+        entity: Optional[str] = None,
+        entity_ids: Optional[list] = None,
+        with_params: Optional[list] = None,
+        limit: int = 100,
+    ) -> Iterator[dict]:
+        """Iterate over events of all pages
+        Doc: https://www.amocrm.ru/developers/content/crm_platform/events-and-notes#events-list
+        Args:
+            created_from (Optional[int], optional): timestamp, included. Defaults to None.
+            created_to (Optional[int], optional): timestamp, included. Defaults to None.
+            types (Optional[list], optional): event types like ['lead_deleted']. Defaults to None.
+            entity (Optional[str], optional): entity type like 'lead'. Defaults to None.
+            entity_ids (Optional[list], optional): ids of entity, with entity only. Defaults to None.
+            with_params (Optional[list], optional): with params in doc. Defaults to None.
+            limit (int, optional): limit per page, max 100. Defaults to 100.
+
+        Returns:
+            Iterator[dict]: events
+        """
+        params = [
+            ("with", ",".join(with_params or ())),
+            ("filter[created_at][from]", created_from),
+            ("filter[created_at][to]", created_to),
+            ("filter[type]", ",".join(types or ())),
+            ("filter[entity]", entity),
+        ]
+        params.extend(("filter[entity_id][]", id_) for id_ in entity_ids or ())
+        query = QuerySpec("events", [(k, v) for k, v in params if v], limit)
+        return self.iter_query(query)
+
+    def get_change_feed(
+        self,
+        types: Optional[list] = None,
+        entity_types: Optional[list] = None,
+        start: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        fetch: bool = True,
+    ) -> ChangeFeed:
+        """Feed of entity changes from events, events of one entity are collapsed
+        into one change with current object fetched by filter[id] list requests
+        Args:
+            types (Optional[list], optional): event types like ['lead_status_changed']. Defaults to all.
+            entity_types (Optional[list], optional): event entity types like ['lead']. Defaults to all.
+            start (Optional[int], optional): timestamp of first events. Defaults to None - now.
+            checkpoint (Optional[Checkpoint], optional): saved cursor of feed. Defaults to None.
+            fetch (bool, optional): fetch current objects of changed entities. Defaults to True.
+
+        Returns:
+            ChangeFeed: feed, use poll() or tail()
+        """
+        return ChangeFeed(self, types, entity_types, start, checkpoint, fetch)
 
     def get_event(
         self,
@@ -3788,7 +5073,7 @@ class BaseClient(object):
         Args:
             entity_type (str): entity type
             page (int, optional): page. Defaults to 1.
-            limit (int, optional): limit per page. Defaults to 250.
+            limit (int, optional): limit per page, 1..250 (ValueError otherwise). Defaults to 250.
             filter_by_id (Union[int, list, None], optional): list or id. Defaults to None.
             filter_by_entity_id (Optional[list], optional): list or entity id. Defaults to None.
             filter_by_note_type (Optional[Union[list, str]], optional): list of not types. Defaults to None.
@@ -3856,27 +5141,22 @@ class BaseClient(object):
                 }
             }
         """
-        url = f"{self.crm_url}/api/v4/{entity_type}/notes"
-        params: dict = {"page": page, "limit": limit}
-        if filter_by_id:
-            params["filter[id]"] = filter_by_id  # type: ignore
-        if filter_by_note_type:
-            params["filter[note_type]"] = filter_by_note_type  # type: ignore
-        if filter_by_entity_id:
-            params["filter[entity_id]"] = filter_by_entity_id  # type: ignore
-        if filter_by_updated_at:
-            params["filter[updated_at]"] = filter_by_updated_at  # type: ignore
-        if filter_by_updated_at_from:
-            params["filter[updated_at][from]"] = filter_by_updated_at_from
-        if filter_by_updated_at_to:
-            params["filter[updated_at][to]"] = filter_by_updated_at_to
-        if order_by_updated_at:
-            params["order[updated_at]"] = order_by_updated_at  # type: ignore
-        if order_by_id:
-            params["order[id]"] = order_by_id  # type: ignore
-
-        url = f"{url}?{urlencode(params)}"
-        return self._send_api_request("get", url)
+        filters = {
+            "id": filter_by_id,
+            "note_type": filter_by_note_type,
+            "entity_id": filter_by_entity_id,
+            "updated_at": filter_by_updated_at,
+            "updated_at__from": filter_by_updated_at_from,
+            "updated_at__to": filter_by_updated_at_to,
+        }
+        order = {"updated_at": order_by_updated_at, "id": order_by_id}
+        query = QuerySpec.create(
+            f"{entity_type}/notes",
+            limit,
+            filters={k: v for k, v in filters.items() if v},
+            order={k: v for k, v in order.items() if v},
+        )
+        return self._send_api_request("get", query.url(self.crm_url, page))
 
     def get_notes_by_entity_type_and_entity_id(
         self,
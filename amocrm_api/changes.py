@@ -0,0 +1,172 @@
+from time import sleep, time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .checkpoints import Checkpoint
+
+# event entity_type: api entity
+ENTITY_TYPES = {
+    "lead": "leads",
+    "contact": "contacts",
+    "company": "companies",
+    "task": "tasks",
+    "customer": "customers",
+}
+
+
+class Change(object):
+    """Events of one entity collapsed into one change
+
+    Args:
+        entity (str): api entity like 'leads'
+        entity_id (int): id of entity
+    """
+
+    __slots__ = ("entity", "entity_id", "events", "object")
+
+    def __init__(self, entity: str, entity_id: int) -> None:
+        self.entity = entity
+        self.entity_id = entity_id
+        self.events: List[dict] = []
+        # current entity, None if deleted, not fetched or not found
+        self.object: Optional[dict] = None
+
+    @property
+    def types(self) -> List[str]:
+        """event types in created order like ['lead_added', 'lead_status_changed']"""
+        return [event["type"] for event in self.events]
+
+    @property
+    def created_at(self) -> int:
+        """created_at of last event"""
+        return self.events[-1]["created_at"]
+
+    @property
+    def deleted(self) -> bool:
+        return self.events[-1]["type"].endswith("_deleted")
+
+    def __repr__(self) -> str:
+        return f"Change({self.entity!r}, {self.entity_id!r}, {self.types!r})"
+
+
+class ChangeFeed(object):
+    """Tailing feed of entity changes from events api
+
+    Every poll reads events created since (created_at, event id) cursor,
+    collapses events of the same entity into one Change and fetches current
+    objects of changed entities with filter[id] list requests.
+
+    Args:
+        client (BaseClient): api client
+        types (Optional[list], optional): event types like ['lead_status_changed']. Defaults to all.
+        entity_types (Optional[list], optional): event entity types like ['lead']. Defaults to all.
+        start (Optional[int], optional): timestamp of first events if nothing saved
+            in checkpoint. Defaults to None - now.
+        checkpoint (Optional[Checkpoint], optional): cursor is saved after changes of
+            every poll are consumed and loaded on start. Defaults to None.
+        fetch (bool, optional): fetch current objects of changed entities. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        types: Optional[list] = None,
+        entity_types: Optional[list] = None,
+        start: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        fetch: bool = True,
+    ) -> None:
+        self.client = client
+        self.types = sorted(types) if types else None
+        self.entity_types = sorted(entity_types) if entity_types else None
+        self.checkpoint = checkpoint
+        self.fetch = fetch
+        self.signature = ["events", self.types, self.entity_types]
+        self.cursor: int = int(time()) if start is None else start
+        # ids of events created at cursor second which were already returned
+        self.boundary: set = set()
+        if checkpoint is not None:
+            state = checkpoint.load(self.signature)
+            if state is not None:
+                self.cursor, self.boundary = state["cursor"], set(state["boundary"])
+
+    def _read_events(self) -> List[dict]:
+        """new events ordered by created_at and id"""
+        entity_types = self.entity_types or ()
+        entity = entity_types[0] if len(entity_types) == 1 else None
+        events: Dict[str, dict] = {}
+        for event in self.client.iter_events(
+            created_from=self.cursor, types=self.types, entity=entity
+        ):
+            if event["created_at"] < self.cursor or event["id"] in self.boundary:
+                continue
+            if entity_types and event.get("entity_type") not in entity_types:
+                continue
+            # pages are ordered from new events, new events shift pages
+            events[event["id"]] = event
+        return sorted(events.values(), key=lambda e: (e["created_at"], e["id"]))
+
+    def _collapse(self, events: List[dict]) -> List[Change]:
+        changes: Dict[Tuple[str, int], Change] = {}
+        for event in events:
+            entity_type = event.get("entity_type")
+            entity = ENTITY_TYPES.get(entity_type, entity_type)
+            key = (entity, event.get("entity_id"))
+            change = changes.pop(key, None) or Change(*key)
+            change.events.append(event)
+            # dict keeps order of last events
+            changes[key] = change
+        return list(changes.values())
+
+    def _fetch_objects(self, changes: List[Change]) -> None:
+        ids_by_entity: Dict[str, list] = {}
+        for change in changes:
+            if not change.deleted and change.entity in ENTITY_TYPES.values():
+                ids_by_entity.setdefault(change.entity, []).append(change.entity_id)
+        found = {
+            entity: self.client._get_entities_by_ids(entity, ids)
+            for entity, ids in ids_by_entity.items()
+        }
+        for change in changes:
+            change.object = found.get(change.entity, {}).get(change.entity_id)
+
+    def poll(self) -> Iterator[Change]:
+        """yield changes since cursor, cursor is moved and saved after
+        last change is consumed
+
+        Returns:
+            Iterator[Change]: changes ordered by their last event
+        """
+        events = self._read_events()
+        changes = self._collapse(events)
+        if self.fetch:
+            self._fetch_objects(changes)
+        yield from changes
+        if not events:
+            return
+        last_created_at = events[-1]["created_at"]
+        boundary = {e["id"] for e in events if e["created_at"] == last_created_at}
+        if last_created_at == self.cursor:
+            boundary |= self.boundary
+        self.cursor, self.boundary = last_created_at, boundary
+        if self.checkpoint is not None:
+            self.checkpoint.save(
+                self.signature, cursor=self.cursor, boundary=sorted(self.boundary)
+            )
+
+    def tail(
+        self, interval: float = 10, stop: Optional[Callable[[], bool]] = None
+    ) -> Iterator[Change]:
+        """poll forever with interval seconds between polls without changes
+
+        Args:
+            interval (float, optional): sleep seconds. Defaults to 10.
+            stop (Optional[Callable[[], bool]], optional): tailing ends when it
+                returns True. Defaults to None.
+        """
+        while stop is None or not stop():
+            count = 0
+            for change in self.poll():
+                count += 1
+                yield change
+            if not count:
+                sleep(interval)
@@ -0,0 +1,86 @@
+import json
+import os
+from threading import Lock
+from typing import Any, Dict, Optional
+
+
+class CheckpointStore(object):
+    """In-memory store of scan states by name"""
+
+    def __init__(self) -> None:
+        self._states: Dict[str, dict] = {}
+        self._lock = Lock()
+
+    def load(self, key: str) -> Optional[dict]:
+        with self._lock:
+            state = self._states.get(key)
+        return dict(state) if state is not None else None
+
+    def save(self, key: str, state: dict) -> None:
+        with self._lock:
+            self._states[key] = dict(state)
+            self._flush()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._states.pop(key, None) is not None:
+                self._flush()
+
+    def _flush(self) -> None:
+        pass
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Store of scan states in local json file, file is replaced atomically on save
+
+    Args:
+        path (str): path of json file, created on first save
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self._states = json.load(file)
+
+    def _flush(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self._states, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class Checkpoint(object):
+    """Named position of one scan in store
+
+    Args:
+        store (CheckpointStore): store of states
+        key (str): name of scan like 'contacts-export'
+    """
+
+    def __init__(self, store: CheckpointStore, key: str) -> None:
+        self.store = store
+        self.key = key
+
+    def load(self, query: Any) -> Optional[dict]:
+        """return saved state of same query, None if nothing saved
+
+        Raises:
+            ValueError: if state was saved by other query
+        """
+        state = self.store.load(self.key)
+        if state is None:
+            return None
+        if state.get("query") != query:
+            raise ValueError(f"Checkpoint {self.key!r} belongs to other query")
+        return state
+
+    def save(self, query: Any, **state: Any) -> None:
+        state["query"] = query
+        self.store.save(self.key, state)
+
+    def clear(self) -> None:
+        self.store.delete(self.key)
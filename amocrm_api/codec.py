@@ -0,0 +1,100 @@
+import json
+from json import JSONDecodeError
+from typing import Any, Optional
+
+
+class JsonCodec(object):
+    """Stdlib json codec, used when no faster backend is installed"""
+
+    name: str = "json"
+
+    def loads(self, data: bytes) -> Any:
+        """parse raw response body
+
+        Args:
+            data (bytes): raw body, utf-8 encoded
+
+        Raises:
+            JSONDecodeError: if body is not valid json
+
+        Returns:
+            Any: parsed object
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """serialise request body
+
+        Args:
+            obj (Any): json serialisable object
+
+        Returns:
+            bytes: utf-8 encoded json
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: bytes) -> Any:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson
+
+        self._ujson = ujson
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._ujson.loads(data)
+        except ValueError as e:
+            raise JSONDecodeError(str(e), "", 0)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """return json codec
+
+    Args:
+        name (Optional[str], optional): 'orjson', 'ujson' or 'json'.
+            Defaults to None - fastest installed backend.
+
+    Raises:
+        ValueError: if unknown codec name
+        ImportError: if requested backend is not installed
+
+    Returns:
+        JsonCodec: codec
+    """
+    codecs = {"orjson": OrjsonCodec, "ujson": UjsonCodec, "json": JsonCodec}
+    if name is not None:
+        if name not in codecs:
+            raise ValueError(f"Unknown json codec: {name}")
+        return codecs[name]()
+    for codec_class in (OrjsonCodec, UjsonCodec):
+        try:
+            return codec_class()
+        except ImportError:
+            continue
+    return JsonCodec()
+
+
+default_codec = get_codec()
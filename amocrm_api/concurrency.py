@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Callable, Iterable, List
+
+
+class RateLimiter(object):
+    """Spaces calls from all threads to at most `rate` per second
+
+    Args:
+        rate (float, optional): calls per second, amoCRM allows 7. Defaults to 7.
+    """
+
+    def __init__(self, rate: float = 7) -> None:
+        self.interval = 1.0 / rate
+        self._next_at = 0.0
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait > 0:
+            sleep(wait)
+
+
+def run_concurrently(
+    func: Callable[..., Any], args_list: Iterable[tuple], max_workers: int
+) -> List[Any]:
+    """call func with every args tuple in thread pool
+
+    Returns:
+        List[Any]: results in order of args_list, first exception is raised
+    """
+    args_list = list(args_list)
+    if max_workers <= 1 or len(args_list) <= 1:
+        return [func(*args) for args in args_list]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(args_list))) as executor:
+        futures = [executor.submit(func, *args) for args in args_list]
+        return [future.result() for future in futures]
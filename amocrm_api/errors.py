@@ -7,3 +7,11 @@ class AmoException(Exception):
     def __str__(self):
         error_message = ''.join(f'{k}: {v}' for k, v in self.error_data.items())
         return f'Code: {self.code}, Detail: {error_message}'
+
+
+class AmoValidationError(AmoException):
+    """Payload rejected by local validation, nothing was sent"""
+
+    def __init__(self, errors: dict, *args):
+        self.errors = errors
+        super().__init__({'validation_errors': errors}, 400, *args)
@@ -0,0 +1,133 @@
+import base64
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from itertools import groupby
+from typing import Iterable, Iterator
+
+MERGE_THRESHOLD = 4096
+
+
+class IdSet(object):
+    """Compact set of int ids: sorted array('q') with small unsorted buffer
+
+    8 bytes per id instead of 60+ of set[int], added ids are buffered and
+    merged into sorted array when buffer grows to 1/8 of array.
+
+    Args:
+        ids (Iterable[int], optional): initial ids. Defaults to ().
+    """
+
+    __slots__ = ("_sorted", "_buffer")
+
+    def __init__(self, ids: Iterable[int] = ()) -> None:
+        self._sorted = array("q")
+        self._buffer: set = set()
+        self.update(ids)
+
+    def _merge(self) -> None:
+        if not self._buffer:
+            return
+        old = self._sorted
+        merged = array("q")
+        start = 0
+        for id_ in sorted(self._buffer):
+            index = bisect_left(old, id_, start)
+            merged.extend(old[start:index])
+            if index == len(old) or old[index] != id_:
+                merged.append(id_)
+            start = index
+        merged.extend(old[start:])
+        self._sorted = merged
+        self._buffer = set()
+
+    def _merge_if_full(self) -> None:
+        if len(self._buffer) >= max(MERGE_THRESHOLD, len(self._sorted) >> 3):
+            self._merge()
+
+    def _in_sorted(self, id_: int) -> bool:
+        ids = self._sorted
+        index = bisect_left(ids, id_)
+        return index < len(ids) and ids[index] == id_
+
+    def __contains__(self, id_: int) -> bool:
+        return id_ in self._buffer or self._in_sorted(id_)
+
+    def add(self, id_: int) -> None:
+        if not self._in_sorted(id_):
+            self._buffer.add(id_)
+            self._merge_if_full()
+
+    def update(self, ids: Iterable[int]) -> None:
+        if isinstance(ids, IdSet):
+            self._merge()
+            ids._merge()
+            merged = merge(self._sorted, ids._sorted)
+            self._sorted = array("q", (id_ for id_, _ in groupby(merged)))
+            return
+        self._buffer.update(ids)
+        self._merge_if_full()
+
+    def union(self, other: Iterable[int]) -> "IdSet":
+        result = IdSet(self)
+        result.update(other)
+        return result
+
+    __or__ = union
+
+    def __len__(self) -> int:
+        self._merge()
+        return len(self._sorted)
+
+    def __iter__(self) -> Iterator[int]:
+        self._merge()
+        return iter(self._sorted)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IdSet):
+            return NotImplemented
+        self._merge()
+        other._merge()
+        return self._sorted == other._sorted
+
+    def __repr__(self) -> str:
+        return f"IdSet(<{len(self)} ids>)"
+
+    def to_bytes(self) -> bytes:
+        """sorted ids as delta encoded varints"""
+        self._merge()
+        out = bytearray()
+        previous = 0
+        for id_ in self._sorted:
+            delta = id_ - previous
+            previous = id_
+            delta = (delta << 1) ^ (delta >> 63)  # zigzag, first id may be negative
+            while delta >= 0x80:
+                out.append((delta & 0x7F) | 0x80)
+                delta >>= 7
+            out.append(delta)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "IdSet":
+        ids = array("q")
+        previous = shift = delta = 0
+        for byte in data:
+            delta |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            previous += (delta >> 1) ^ -(delta & 1)
+            ids.append(previous)
+            shift = delta = 0
+        result = cls()
+        result._sorted = ids
+        return result
+
+    def dumps(self) -> str:
+        """serialise to ascii string for json checkpoints"""
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def loads(cls, data: str) -> "IdSet":
+        return cls.from_bytes(base64.b64decode(data))
@@ -5,6 +5,7 @@ from urllib.parse import urlencode
 
 from .errors import AmoException
 from .base import BaseClient
+from .projection import Projection
 
 
 class AmoLegacyClient(BaseClient):
@@ -16,6 +17,7 @@ class AmoLegacyClient(BaseClient):
             token (str): seckter token
             crm_url (str): your crm url like https://example.amocrm.ru
         """
+        super().__init__()
         self.login = login
         self.token = token
         self.crm_url = crm_url if not crm_url.endswith('/') else crm_url[:-1]
@@ -44,15 +46,21 @@ class AmoLegacyClient(BaseClient):
         raise AmoException(auth_response)
 
     def _send_api_request(
-        self, method: str, url: str, data: Optional[dict] = None
+        self,
+        method: str,
+        url: str,
+        data: Optional[dict] = None,
+        projection: Optional[Projection] = None,
     ) -> dict:
         try:
-            response = self._session.__getattribute__(method)(url, json=data)
+            response = self._request(method, url, data)
             if response.status_code == 204:
                 return {}
-            json_data = response.json()
+            json_data = self._parse_response_body(response)
             if 'error' in json_data:
                 raise AmoException(json_data)
+            if projection is not None:
+                json_data = projection.apply(json_data)
             return json_data
         except (ConnectTimeout, ConnectionError, JSONDecodeError) as e:
             raise AmoException({'error': str(e)})
@@ -0,0 +1,283 @@
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .mirror import TABLES, numeric_value
+from .schema import ENUM_TYPES, NUMERIC_TYPES
+
+LINKED_ENTITIES = ("leads", "contacts", "companies")
+# (id, to_id) pairs of links stored from any side
+LINK_PAIRS = (
+    "SELECT entity_id AS id, to_entity_id AS to_id FROM links "
+    "WHERE entity = ? AND to_entity = ? "
+    "UNION SELECT to_entity_id, entity_id FROM links WHERE entity = ? AND to_entity = ?"
+)
+ORDER_DIRECTIONS = ("asc", "desc")
+
+Clause = Tuple[str, list]
+
+
+class LocalQuery(object):
+    """Queries over SqliteMirror tables with filters shaped like get_leads filters
+
+    Filters:
+        'status_id': 142 or [142, 143] - equal or in list, any column of mirror table
+        'id': [1, 2] - same as filter_ids
+        'created_at__from': <timestamp>, 'price__to': 1000 - ranges of any column
+        'statuses': [{'pipeline_id': 1300, 'status_id': 142}] - any of pairs
+        'custom_fields_values': {<field id, code or name>: value, list of values
+            or {'from': .., 'to': ..}} - enum fields match enum id or enum value
+        'leads', 'contacts', 'companies': {<filters of linked entity>} - has linked
+            object which matches filters
+
+    Args:
+        connection (sqlite3.Connection): connection of SqliteMirror
+        codec (JsonCodec): codec of `data` column
+    """
+
+    def __init__(self, connection: sqlite3.Connection, codec: Any) -> None:
+        self.connection = connection
+        self.codec = codec
+
+    def _resolve_field(self, entity: str, key: Any) -> Tuple[int, str]:
+        """return (field id, field type) by id, code or name
+
+        Raises:
+            KeyError: if unknown field
+        """
+        if isinstance(key, int):
+            sql = "SELECT id, type FROM custom_fields WHERE entity = ? AND id = ?"
+            row = self.connection.execute(sql, (entity, key)).fetchone()
+        else:
+            sql = (
+                "SELECT id, type FROM custom_fields WHERE entity = ? "
+                "AND (upper(code) = upper(?) OR lower(name) = lower(?)) "
+                "ORDER BY code IS NULL"
+            )
+            row = self.connection.execute(sql, (entity, key, key)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown {entity} custom field {key!r}")
+        return row[0], row[1]
+
+    @staticmethod
+    def _match(column: str, value: Any) -> Clause:
+        if isinstance(value, dict):
+            clauses, params = [], []
+            if value.get("from") is not None:
+                clauses.append(f"{column} >= ?")
+                params.append(value["from"])
+            if value.get("to") is not None:
+                clauses.append(f"{column} <= ?")
+                params.append(value["to"])
+            return " AND ".join(clauses) or "1", params
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            if not values:
+                return "0", []
+            return f"{column} IN ({', '.join('?' * len(values))})", values
+        return f"{column} = ?", [value]
+
+    def _field_clause(self, entity: str, key: Any, value: Any) -> Clause:
+        field_id, field_type = self._resolve_field(entity, key)
+        column = "value"
+        if field_type in ENUM_TYPES:
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            if all(isinstance(v, int) for v in values):
+                column = "enum_id"
+        elif field_type in NUMERIC_TYPES:
+            # mirror stores numeric values as numbers
+            if isinstance(value, dict):
+                value = {k: numeric_value(v) for k, v in value.items()}
+            elif isinstance(value, (list, tuple, set)):
+                value = [numeric_value(v) for v in value]
+            else:
+                value = numeric_value(value)
+        elif isinstance(value, dict):
+            # api returns numeric values as strings
+            column = "CAST(value AS REAL)"
+        match, params = self._match(column, value)
+        sql = (
+            "id IN (SELECT entity_id FROM field_values "
+            f"WHERE entity = ? AND field_id = ? AND {match})"
+        )
+        return sql, [entity, field_id] + params
+
+    def where(self, entity: str, filters: Optional[dict]) -> Clause:
+        """compile filters to sql condition over entity table
+
+        Raises:
+            ValueError: if unknown filter
+            KeyError: if unknown custom field
+        """
+        columns = ("id",) + TABLES[entity]
+        clauses: List[Clause] = []
+        for key, value in (filters or {}).items():
+            name, _, bound = key.rpartition("__")
+            if key == "custom_fields_values":
+                clauses.extend(
+                    self._field_clause(entity, field_key, field_value)
+                    for field_key, field_value in value.items()
+                )
+            elif key in LINKED_ENTITIES and key != entity:
+                sql, params = self.where(key, value)
+                sql = (
+                    f"id IN (SELECT id FROM ({LINK_PAIRS}) "
+                    f"WHERE to_id IN (SELECT id FROM {key} WHERE {sql}))"
+                )
+                clauses.append((sql, [entity, key, key, entity] + params))
+            elif key == "statuses":
+                pairs = [(s["pipeline_id"], s["status_id"]) for s in value]
+                sql = " OR ".join("(pipeline_id = ? AND status_id = ?)" for _ in pairs)
+                clauses.append((f"({sql or '0'})", [v for pair in pairs for v in pair]))
+            elif name in columns and bound in ("from", "to"):
+                if not value:
+                    # empty ranges are skipped like in api filters
+                    continue
+                operator = ">=" if bound == "from" else "<="
+                clauses.append((f"{name} {operator} ?", [value]))
+            elif key in columns:
+                clauses.append(self._match(key, value))
+            else:
+                raise ValueError(f"Unknown {entity} filter {key!r}")
+        sql = " AND ".join(clause for clause, _ in clauses) or "1"
+        return sql, [param for _, params in clauses for param in params]
+
+    @staticmethod
+    def _order_by(entity: str, order: Optional[dict]) -> str:
+        columns = ("id",) + TABLES[entity]
+        terms = []
+        for column, direction in (order or {"id": "asc"}).items():
+            if column not in columns or direction.lower() not in ORDER_DIRECTIONS:
+                raise ValueError(f"Invalid {entity} order {column!r}: {direction!r}")
+            terms.append(f"{column} {direction.upper()}")
+        return ", ".join(terms)
+
+    def select(
+        self,
+        entity: str,
+        filters: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+        order: Optional[dict] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Iterator[dict]:
+        """yield mirrored objects which match filters
+
+        Args:
+            entity (str): leads, contacts, companies, tasks or notes
+            filters (Optional[dict], optional): filters like in class doc. Defaults to None.
+            filter_ids (Optional[list], optional): ids like [1, 2]. Defaults to None.
+            order (Optional[dict], optional): like {'updated_at': 'desc'}. Defaults to id asc.
+            limit (Optional[int], optional): max objects. Defaults to None - all.
+            offset (int, optional): skipped objects. Defaults to 0.
+
+        Returns:
+            Iterator[dict]: objects like api returns
+        """
+        if filter_ids is not None:
+            filters = dict(filters or {}, id=list(filter_ids))
+        where, params = self.where(entity, filters)
+        order_by = self._order_by(entity, order)
+        sql = f"SELECT data FROM {entity} WHERE {where} ORDER BY {order_by}"
+        if limit is not None or offset:
+            sql = f"{sql} LIMIT ? OFFSET ?"
+            params = params + [-1 if limit is None else limit, offset]
+        loads = self.codec.loads
+        for (data,) in self.connection.execute(sql, params):
+            yield loads(data)
+
+    def count(self, entity: str, filters: Optional[dict] = None) -> int:
+        where, params = self.where(entity, filters)
+        sql = f"SELECT count(*) FROM {entity} WHERE {where}"
+        return self.connection.execute(sql, params).fetchone()[0]
+
+    def linked(self, entity: str, ids: list, to_entity: str) -> Dict[int, List[dict]]:
+        """return {id: linked objects of to_entity} by mirrored links of both sides"""
+        result: Dict[int, List[dict]] = {id_: [] for id_ in ids}
+        if not ids:
+            return result
+        sql = (
+            f"SELECT pairs.id, t.data FROM ({LINK_PAIRS}) pairs JOIN {to_entity} t "
+            f"ON t.id = pairs.to_id WHERE pairs.id IN ({', '.join('?' * len(ids))}) "
+            "ORDER BY t.id"
+        )
+        params = [entity, to_entity, to_entity, entity] + list(ids)
+        loads = self.codec.loads
+        for entity_id, data in self.connection.execute(sql, params):
+            result[entity_id].append(loads(data))
+        return result
+
+    def _get_entities(
+        self,
+        entity: str,
+        limit: int = 250,
+        page: int = 1,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+        order: Optional[dict] = None,
+    ) -> dict:
+        offset = (page - 1) * limit
+        items = list(self.select(entity, filters, filter_ids, order, limit + 1, offset))
+        data: dict = {"_page": page, "_embedded": {entity: items[:limit]}}
+        if len(items) > limit:
+            data["_links"] = {"next": {}}
+            items = items[:limit]
+        for to_entity in LINKED_ENTITIES:
+            if to_entity == entity or to_entity not in (with_params or ()):
+                continue
+            linked = self.linked(entity, [item["id"] for item in items], to_entity)
+            for item in items:
+                item.setdefault("_embedded", {})[to_entity] = linked[item["id"]]
+        return data
+
+    def get_leads(
+        self,
+        limit: int = 250,
+        page: int = 1,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+        order: Optional[dict] = None,
+    ) -> dict:
+        """Get mirrored leads, params like in BaseClient.get_leads, with_params
+        'contacts' and 'companies' embed full linked objects into `_embedded`
+
+        Returns:
+            dict: page like get_leads, `_links.next` is set if there are more leads
+        """
+        params: dict = {k: v for k, v in locals().items() if k != "self"}
+        return self._get_entities("leads", **params)
+
+    def get_contacts(
+        self,
+        limit: int = 250,
+        page: int = 1,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        order: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+    ) -> dict:
+        params: dict = {k: v for k, v in locals().items() if k != "self"}
+        return self._get_entities("contacts", **params)
+
+    def get_companies(
+        self,
+        limit: int = 250,
+        page: int = 1,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        order: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+    ) -> dict:
+        params: dict = {k: v for k, v in locals().items() if k != "self"}
+        return self._get_entities("companies", **params)
+
+    def get_tasks(
+        self,
+        limit: int = 250,
+        page: int = 1,
+        filters: Optional[dict] = None,
+        order: Optional[dict] = None,
+    ) -> dict:
+        params: dict = {k: v for k, v in locals().items() if k != "self"}
+        return self._get_entities("tasks", **params)
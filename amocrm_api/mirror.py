@@ -0,0 +1,424 @@
+import sqlite3
+from time import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .checkpoints import Checkpoint, CheckpointStore
+from .schema import NUMERIC_TYPES
+
+# table: scalar columns, every table has also id and data columns
+TABLES = {
+    "leads": (
+        "name",
+        "price",
+        "responsible_user_id",
+        "group_id",
+        "status_id",
+        "pipeline_id",
+        "loss_reason_id",
+        "created_by",
+        "created_at",
+        "updated_at",
+        "closed_at",
+        "is_deleted",
+    ),
+    "contacts": (
+        "name",
+        "first_name",
+        "last_name",
+        "responsible_user_id",
+        "group_id",
+        "created_by",
+        "created_at",
+        "updated_at",
+    ),
+    "companies": (
+        "name",
+        "responsible_user_id",
+        "group_id",
+        "created_by",
+        "created_at",
+        "updated_at",
+    ),
+    "tasks": (
+        "entity_id",
+        "entity_type",
+        "responsible_user_id",
+        "task_type_id",
+        "is_completed",
+        "complete_till",
+        "created_at",
+        "updated_at",
+    ),
+    "notes": (
+        "entity_type",
+        "entity_id",
+        "note_type",
+        "responsible_user_id",
+        "created_at",
+        "updated_at",
+    ),
+}
+# entities synced by moving updated_at cursor with ordered pages
+ORDERED_ENTITIES = ("leads", "contacts", "companies")
+NOTES_ENTITY_TYPES = ("leads", "contacts", "companies")
+CUSTOM_FIELDS_ENTITIES = ("leads", "contacts", "companies")
+DELETE_EVENTS = {
+    "lead_deleted": "leads",
+    "contact_deleted": "contacts",
+    "company_deleted": "companies",
+    "task_deleted": "tasks",
+}
+SYNC_ENTITIES = ("pipelines", "users", "leads", "contacts", "companies", "tasks", "notes")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, state TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS pipelines (
+    id INTEGER PRIMARY KEY, name TEXT, sort INTEGER, is_main INTEGER, data TEXT
+);
+CREATE TABLE IF NOT EXISTS statuses (
+    id INTEGER, pipeline_id INTEGER, name TEXT, sort INTEGER, type INTEGER,
+    PRIMARY KEY (pipeline_id, id)
+);
+CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, data TEXT);
+CREATE TABLE IF NOT EXISTS custom_fields (
+    entity TEXT, id INTEGER, code TEXT, name TEXT, type TEXT, enums TEXT,
+    PRIMARY KEY (entity, id)
+);
+CREATE TABLE IF NOT EXISTS field_values (
+    entity TEXT, entity_id INTEGER, field_id INTEGER, enum_id INTEGER, value
+);
+CREATE INDEX IF NOT EXISTS field_values_field ON field_values (entity, field_id, value);
+CREATE INDEX IF NOT EXISTS field_values_enum ON field_values (entity, field_id, enum_id);
+CREATE INDEX IF NOT EXISTS field_values_entity ON field_values (entity, entity_id);
+CREATE TABLE IF NOT EXISTS links (
+    entity TEXT, entity_id INTEGER, to_entity TEXT, to_entity_id INTEGER,
+    is_main INTEGER, PRIMARY KEY (entity, entity_id, to_entity, to_entity_id)
+);
+CREATE INDEX IF NOT EXISTS links_to ON links (to_entity, to_entity_id, entity);
+"""
+
+
+def numeric_value(value: Any) -> Any:
+    """return int or float of number like '1500' or '12.5', other values as is"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    return int(number) if number.is_integer() else number
+
+
+class SqliteCheckpointStore(CheckpointStore):
+    """Store of scan states in sync_state table, save commits connection,
+    so mirrored rows and cursor of page are committed together"""
+
+    def __init__(self, connection: sqlite3.Connection, codec: Any) -> None:
+        super().__init__()
+        self.connection = connection
+        self.codec = codec
+
+    def load(self, key: str) -> Optional[dict]:
+        row = self.connection.execute(
+            "SELECT state FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+        return self.codec.loads(row[0]) if row else None
+
+    def save(self, key: str, state: dict) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sync_state (key, state) VALUES (?, ?)",
+            (key, self.codec.dumps(state).decode("utf-8")),
+        )
+        self.connection.commit()
+
+    def delete(self, key: str) -> None:
+        self.connection.execute("DELETE FROM sync_state WHERE key = ?", (key,))
+        self.connection.commit()
+
+
+class SqliteMirror(object):
+    """Local SQLite copy of leads, contacts, companies, tasks, notes, pipelines and users
+
+    First sync loads all objects, next syncs pull objects changed since saved
+    updated_at cursors and delete objects from *_deleted events.
+    Every entity table has scalar columns, `data` column with full json object,
+    custom fields values are in `field_values` and leads/contacts/companies
+    relations are in `links` table.
+
+    Args:
+        client (BaseClient): api client
+        path (str, optional): sqlite database path. Defaults to ":memory:".
+    """
+
+    def __init__(self, client: Any, path: str = ":memory:") -> None:
+        self.client = client
+        self.codec = client.json_codec
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        for table, columns in TABLES.items():
+            column_defs = ", ".join(columns)
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                f"(id INTEGER PRIMARY KEY, {column_defs}, data TEXT)"
+            )
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_updated_at ON {table} (updated_at)"
+            )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS leads_status ON leads (pipeline_id, status_id)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS leads_responsible ON leads (responsible_user_id)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS tasks_entity ON tasks (entity_type, entity_id)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS notes_entity ON notes (entity_type, entity_id)"
+        )
+        self.connection.commit()
+        self.store = SqliteCheckpointStore(self.connection, self.codec)
+
+    @property
+    def query(self) -> "LocalQuery":
+        """queries over mirrored objects, see local_query.LocalQuery"""
+        from .local_query import LocalQuery
+
+        return LocalQuery(self.connection, self.codec)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _dumps(self, obj: Any) -> str:
+        return self.codec.dumps(obj).decode("utf-8")
+
+    def _scalar(self, value: Any) -> Any:
+        """value as is if sqlite can store it, else json"""
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        return self._dumps(value)
+
+    def sync(self, entities: Iterable[str] = SYNC_ENTITIES) -> Dict[str, int]:
+        """full load on first call, changes since previous sync on next calls
+
+        Args:
+            entities (Iterable[str], optional): names from SYNC_ENTITIES. Defaults to all.
+
+        Returns:
+            Dict[str, int]: number of written objects by entity and deleted objects
+        """
+        entities = list(entities)
+        # deletions before first sync are already absent in loaded objects
+        if self.store.load("events") is None:
+            self.store.save("events", {"created_at": int(time())})
+        counts: Dict[str, int] = {}
+        for entity in entities:
+            if entity == "pipelines":
+                counts[entity] = self.sync_pipelines()
+            elif entity == "users":
+                counts[entity] = self.sync_users()
+            elif entity == "notes":
+                counts[entity] = sum(
+                    self.sync_entity(f"{entity_type}/notes")
+                    for entity_type in NOTES_ENTITY_TYPES
+                )
+            else:
+                counts[entity] = self.sync_entity(entity)
+        counts["deleted"] = self.apply_deletions()
+        return counts
+
+    def sync_pipelines(self) -> int:
+        pipelines = self.client.get_pipelines().get("_embedded", {}).get("pipelines", [])
+        with self.connection:
+            self.connection.execute("DELETE FROM pipelines")
+            self.connection.execute("DELETE FROM statuses")
+            for pipeline in pipelines:
+                self.connection.execute(
+                    "INSERT INTO pipelines VALUES (?, ?, ?, ?, ?)",
+                    (
+                        pipeline["id"],
+                        pipeline.get("name"),
+                        pipeline.get("sort"),
+                        pipeline.get("is_main"),
+                        self._dumps(pipeline),
+                    ),
+                )
+                statuses = pipeline.get("_embedded", {}).get("statuses", [])
+                self.connection.executemany(
+                    "INSERT INTO statuses VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            status["id"],
+                            pipeline["id"],
+                            status.get("name"),
+                            status.get("sort"),
+                            status.get("type"),
+                        )
+                        for status in statuses
+                    ],
+                )
+        return len(pipelines)
+
+    def sync_users(self) -> int:
+        users = self.client._get_all_users()
+        with self.connection:
+            self.connection.execute("DELETE FROM users")
+            self.connection.executemany(
+                "INSERT INTO users VALUES (?, ?, ?, ?)",
+                [
+                    (user["id"], user.get("name"), user.get("email"), self._dumps(user))
+                    for user in users
+                ],
+            )
+        return len(users)
+
+    def sync_custom_fields(self, entity: str) -> int:
+        schema = self.client.get_custom_field_schema(entity, refresh=True)
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM custom_fields WHERE entity = ?", (entity,)
+            )
+            self.connection.executemany(
+                "INSERT INTO custom_fields VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (entity, f.id, f.code, f.name, f.type, self._dumps(enums))
+                    for f, enums in (
+                        (f, [{"id": k, "value": v} for k, v in f.enums.items()])
+                        for f in schema
+                    )
+                ],
+            )
+        return len(schema)
+
+    def _iter_changes(self, entity: str) -> Iterator[dict]:
+        if entity in ORDERED_ENTITIES or entity.endswith("/notes"):
+            with_params = ["contacts"] if entity == "leads" else None
+            checkpoint = Checkpoint(self.store, entity)
+            return self.client.iter_by_updated_at(
+                entity, with_params=with_params, checkpoint=checkpoint
+            )
+        return self._iter_unordered_changes(entity)
+
+    def _iter_unordered_changes(self, entity: str) -> Iterator[dict]:
+        """pages of objects updated from saved cursor, for entities without
+        updated_at order, new cursor is max updated_at of read objects"""
+        cursor = (self.store.load(entity) or {}).get("cursor")
+        filters = {"updated_at__from": cursor} if cursor else None
+        for item in self.client._iter_entities(entity, filters=filters):
+            cursor = max(cursor or 0, item.get("updated_at") or 0)
+            yield item
+        self.store.save(entity, {"cursor": cursor})
+
+    def sync_entity(self, entity: str) -> int:
+        """write objects changed since saved cursor, rows of every page are
+        committed with its cursor
+
+        Args:
+            entity (str): leads, contacts, companies, tasks or '<entity_type>/notes'
+
+        Returns:
+            int: number of written objects
+        """
+        key = entity.split("/")[-1]
+        columns = TABLES[key]
+        if key in CUSTOM_FIELDS_ENTITIES:
+            self.sync_custom_fields(key)
+        placeholders = ", ".join("?" * (len(columns) + 2))
+        insert = f"INSERT OR REPLACE INTO {key} VALUES ({placeholders})"
+        count = 0
+        for item in self._iter_changes(entity):
+            row = [item["id"]] + [item.get(column) for column in columns]
+            if key == "notes" and row[1] is None:
+                row[1] = entity.split("/")[0]
+            row.append(self._dumps(item))
+            self.connection.execute(insert, row)
+            if key in CUSTOM_FIELDS_ENTITIES:
+                self._write_field_values(key, item)
+                self._write_links(key, item)
+            count += 1
+        self.connection.commit()
+        return count
+
+    def _write_field_values(self, entity: str, item: dict) -> None:
+        """write values of custom fields, values of numeric fields are stored as numbers"""
+        self.connection.execute(
+            "DELETE FROM field_values WHERE entity = ? AND entity_id = ?",
+            (entity, item["id"]),
+        )
+        schema = self.client.get_custom_field_schema(entity)
+        rows = []
+        for field in item.get("custom_fields_values") or ():
+            schema_field = schema.find_field(field["field_id"])
+            field_type = schema_field.type if schema_field else field.get("field_type")
+            for value in field.get("values") or ():
+                scalar = self._scalar(value.get("value"))
+                if field_type in NUMERIC_TYPES:
+                    scalar = numeric_value(scalar)
+                rows.append(
+                    (entity, item["id"], field["field_id"], value.get("enum_id"), scalar)
+                )
+        self.connection.executemany(
+            "INSERT INTO field_values VALUES (?, ?, ?, ?, ?)", rows
+        )
+
+    def _write_links(self, entity: str, item: dict) -> None:
+        embedded = item.get("_embedded") or {}
+        rows = [
+            (entity, item["id"], to_entity, linked["id"], linked.get("is_main"))
+            for to_entity in ("contacts", "companies")
+            if to_entity != entity and to_entity in embedded
+            for linked in embedded[to_entity] or ()
+        ]
+        if entity == "leads":
+            # contacts are embedded only with with_params=['contacts']
+            self.connection.execute(
+                "DELETE FROM links WHERE entity = ? AND entity_id = ?",
+                (entity, item["id"]),
+            )
+        else:
+            self.connection.execute(
+                "DELETE FROM links WHERE entity = ? AND entity_id = ? AND to_entity = ?",
+                (entity, item["id"], "companies"),
+            )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?, ?)", rows
+        )
+
+    def delete(self, entity: str, ids: Iterable[int]) -> int:
+        """delete objects with their custom fields values and links"""
+        ids = [(id_,) for id_ in ids]
+        with self.connection:
+            self.connection.executemany(f"DELETE FROM {entity} WHERE id = ?", ids)
+            self.connection.executemany(
+                "DELETE FROM field_values WHERE entity = ? AND entity_id = ?",
+                [(entity, id_) for id_, in ids],
+            )
+            self.connection.executemany(
+                "DELETE FROM links WHERE entity = ? AND entity_id = ?",
+                [(entity, id_) for id_, in ids],
+            )
+            self.connection.executemany(
+                "DELETE FROM links WHERE to_entity = ? AND to_entity_id = ?",
+                [(entity, id_) for id_, in ids],
+            )
+        return len(ids)
+
+    def apply_deletions(self) -> int:
+        """delete objects of *_deleted events created since saved events cursor
+
+        Returns:
+            int: number of deleted objects
+        """
+        state = self.store.load("events") or {}
+        cursor = state.get("created_at")
+        deleted: Dict[str, list] = {}
+        for event in self.client.iter_events(
+            created_from=cursor, types=list(DELETE_EVENTS)
+        ):
+            entity = DELETE_EVENTS.get(event.get("type"))
+            if entity is not None:
+                deleted.setdefault(entity, []).append(event["entity_id"])
+            cursor = max(cursor or 0, event.get("created_at") or 0)
+        count = sum(self.delete(entity, ids) for entity, ids in deleted.items())
+        self.store.save("events", {"created_at": cursor})
+        return count
@@ -0,0 +1,455 @@
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional, Tuple
+
+
+class FieldValue(object):
+    """One value of custom field"""
+
+    __slots__ = ("value", "enum_id", "enum_code")
+
+    def __init__(
+        self,
+        value: Any = None,
+        enum_id: Optional[int] = None,
+        enum_code: Optional[str] = None,
+    ) -> None:
+        self.value = value
+        self.enum_id = enum_id
+        self.enum_code = enum_code
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FieldValue":
+        return cls(data.get("value"), data.get("enum_id"), data.get("enum_code"))
+
+    def to_payload(self) -> dict:
+        payload = {}
+        if self.value is not None:
+            payload["value"] = self.value
+        if self.enum_id is not None:
+            payload["enum_id"] = self.enum_id
+        if self.enum_code is not None:
+            payload["enum_code"] = self.enum_code
+        return payload
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, FieldValue):
+            return NotImplemented
+        return (self.value, self.enum_id, self.enum_code) == (
+            other.value,
+            other.enum_id,
+            other.enum_code,
+        )
+
+    def __repr__(self) -> str:
+        return f"FieldValue({self.value!r}, {self.enum_id!r}, {self.enum_code!r})"
+
+
+class CustomFieldValue(object):
+    """Custom field of entity with its values"""
+
+    __slots__ = ("field_id", "field_code", "field_type", "values")
+
+    def __init__(
+        self,
+        field_id: Optional[int] = None,
+        values: Tuple[FieldValue, ...] = (),
+        field_code: Optional[str] = None,
+        field_type: Optional[str] = None,
+    ) -> None:
+        self.field_id = field_id
+        self.values = values
+        self.field_code = field_code
+        self.field_type = field_type
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CustomFieldValue":
+        values = tuple(FieldValue.from_dict(v) for v in data.get("values") or ())
+        return cls(
+            data.get("field_id"), values, data.get("field_code"), data.get("field_type")
+        )
+
+    @property
+    def value(self) -> Any:
+        """value of first item, None if no values"""
+        return self.values[0].value if self.values else None
+
+    def to_payload(self) -> dict:
+        payload: dict = {"values": [v.to_payload() for v in self.values]}
+        if self.field_id is not None:
+            payload["field_id"] = self.field_id
+        else:
+            payload["field_code"] = self.field_code
+        return payload
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CustomFieldValue):
+            return NotImplemented
+        return (self.field_id, self.field_code, self.values) == (
+            other.field_id,
+            other.field_code,
+            other.values,
+        )
+
+    def __repr__(self) -> str:
+        return f"CustomFieldValue({self.field_id!r}, {self.values!r})"
+
+
+_TUPLE_FIELDS = frozenset(("custom_fields_values", "tags", "contacts", "companies"))
+
+
+def parse_custom_fields(values: Optional[list]) -> Tuple[CustomFieldValue, ...]:
+    if not values:
+        return ()
+    return tuple(CustomFieldValue.from_dict(v) for v in values)
+
+
+class Model(object):
+    """Base of compact entity records
+
+    `_fields` are copied from response as is, `_writable` are sent back
+    by to_payload, audit fields like updated_at are read only so updates
+    do not move them back. Timestamps are kept as int, see get_datetime.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _writable: Tuple[str, ...] = ()
+
+    def __init__(self, **kwargs: Any) -> None:
+        for name in self._slot_names():
+            setattr(self, name, kwargs.pop(name, self._default(name)))
+        if kwargs:
+            raise TypeError(f"Unknown fields: {', '.join(kwargs)}")
+
+    @classmethod
+    def _slot_names(cls) -> Tuple[str, ...]:
+        names: tuple = ()
+        for klass in reversed(cls.__mro__):
+            names += tuple(klass.__dict__.get("__slots__", ()))
+        return names
+
+    @staticmethod
+    def _default(name: str) -> Any:
+        return () if name in _TUPLE_FIELDS else None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Model":
+        """create record from api object
+
+        Args:
+            data (dict): object like one of get_leads()['_embedded']['leads']
+
+        Returns:
+            Model: record
+        """
+        obj = cls.__new__(cls)
+        get = data.get
+        for name in cls._fields:
+            setattr(obj, name, get(name))
+        obj._load_extra(data)
+        return obj
+
+    def _load_extra(self, data: dict) -> None:
+        pass
+
+    def _dump_extra(self, payload: dict) -> None:
+        pass
+
+    def to_payload(self) -> dict:
+        """return object for create/update methods, None values are skipped"""
+        payload = {}
+        for name in self._writable:
+            value = getattr(self, name)
+            if value is not None:
+                payload[name] = value
+        self._dump_extra(payload)
+        return payload
+
+    def get_datetime(self, name: str) -> Optional[datetime]:
+        """return timestamp field like 'updated_at' as aware datetime in utc"""
+        value = getattr(self, name)
+        if value is None:
+            return None
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+
+    def get_custom_field(self, field_id: int) -> Optional[CustomFieldValue]:
+        for field in getattr(self, "custom_fields_values", ()):
+            if field.field_id == field_id:
+                return field
+        return None
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self._slot_names()
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+
+class _CustomFieldsModel(Model):
+    __slots__ = ("custom_fields_values", "tags")
+
+    def _load_extra(self, data: dict) -> None:
+        self.custom_fields_values = parse_custom_fields(data.get("custom_fields_values"))
+        embedded = data.get("_embedded") or {}
+        self.tags = tuple(
+            (t.get("id"), t.get("name")) for t in embedded.get("tags") or ()
+        )
+
+    def _dump_extra(self, payload: dict) -> None:
+        if self.custom_fields_values:
+            payload["custom_fields_values"] = [
+                field.to_payload() for field in self.custom_fields_values
+            ]
+        if self.tags:
+            tags = [{"id": id_} if id_ else {"name": name} for id_, name in self.tags]
+            payload["_embedded"] = {"tags": tags}
+
+
+class Lead(_CustomFieldsModel):
+    """Lead record, `contacts` is tuple of (id, is_main), `companies` is tuple of ids"""
+
+    _fields = (
+        "id",
+        "name",
+        "price",
+        "responsible_user_id",
+        "group_id",
+        "status_id",
+        "pipeline_id",
+        "loss_reason_id",
+        "source_id",
+        "created_by",
+        "updated_by",
+        "created_at",
+        "updated_at",
+        "closed_at",
+        "closest_task_at",
+        "is_deleted",
+        "score",
+        "account_id",
+    )
+    _writable = (
+        "id",
+        "name",
+        "price",
+        "responsible_user_id",
+        "status_id",
+        "pipeline_id",
+        "loss_reason_id",
+        "closed_at",
+    )
+    __slots__ = _fields + ("contacts", "companies")
+
+    def _load_extra(self, data: dict) -> None:
+        super()._load_extra(data)
+        embedded = data.get("_embedded") or {}
+        self.contacts = tuple(
+            (c.get("id"), bool(c.get("is_main"))) for c in embedded.get("contacts") or ()
+        )
+        self.companies = tuple(c.get("id") for c in embedded.get("companies") or ())
+
+
+class Contact(_CustomFieldsModel):
+    """Contact record, `companies` is tuple of ids"""
+
+    _fields = (
+        "id",
+        "name",
+        "first_name",
+        "last_name",
+        "responsible_user_id",
+        "group_id",
+        "created_by",
+        "updated_by",
+        "created_at",
+        "updated_at",
+        "closest_task_at",
+        "is_deleted",
+        "account_id",
+    )
+    _writable = (
+        "id",
+        "name",
+        "first_name",
+        "last_name",
+        "responsible_user_id",
+    )
+    __slots__ = _fields + ("companies",)
+
+    def _load_extra(self, data: dict) -> None:
+        super()._load_extra(data)
+        embedded = data.get("_embedded") or {}
+        self.companies = tuple(c.get("id") for c in embedded.get("companies") or ())
+
+
+class Company(_CustomFieldsModel):
+    """Company record, `contacts` is tuple of ids"""
+
+    _fields = (
+        "id",
+        "name",
+        "responsible_user_id",
+        "group_id",
+        "created_by",
+        "updated_by",
+        "created_at",
+        "updated_at",
+        "closest_task_at",
+        "is_deleted",
+        "account_id",
+    )
+    _writable = (
+        "id",
+        "name",
+        "responsible_user_id",
+    )
+    __slots__ = _fields + ("contacts",)
+
+    def _load_extra(self, data: dict) -> None:
+        super()._load_extra(data)
+        embedded = data.get("_embedded") or {}
+        self.contacts = tuple(c.get("id") for c in embedded.get("contacts") or ())
+
+
+class Task(Model):
+    """Task record"""
+
+    _fields = (
+        "id",
+        "created_by",
+        "updated_by",
+        "created_at",
+        "updated_at",
+        "responsible_user_id",
+        "group_id",
+        "entity_id",
+        "entity_type",
+        "is_completed",
+        "task_type_id",
+        "text",
+        "duration",
+        "complete_till",
+        "result",
+        "account_id",
+    )
+    _writable = (
+        "id",
+        "responsible_user_id",
+        "entity_id",
+        "entity_type",
+        "is_completed",
+        "task_type_id",
+        "text",
+        "duration",
+        "complete_till",
+        "result",
+    )
+    __slots__ = _fields
+
+
+MODELS = {"leads": Lead, "contacts": Contact, "companies": Company, "tasks": Task}
+
+
+class LazyRecord(object):
+    """Read-only view of api object
+
+    Top level keys are returned from raw object as is, custom fields and
+    `_embedded` items are converted only when accessed and then cached.
+    """
+
+    __slots__ = ("_raw", "_key", "_cache")
+
+    def __init__(self, raw: dict, key: Optional[str] = None) -> None:
+        self._raw = raw
+        self._key = key
+        self._cache: Optional[dict] = None
+
+    def _cached(self, name: str, factory: Any) -> Any:
+        if self._cache is None:
+            self._cache = {}
+        if name not in self._cache:
+            self._cache[name] = factory()
+        return self._cache[name]
+
+    def __getattr__(self, name: str) -> Any:
+        # slots are not set yet while unpickling or copying
+        if name in LazyRecord.__slots__ or name.startswith("__"):
+            raise AttributeError(name)
+        raw = self._raw
+        if name == "custom_fields_values":
+            return self._cached(
+                name, lambda: parse_custom_fields(raw.get("custom_fields_values"))
+            )
+        if name in raw:
+            return raw[name]
+        embedded = raw.get("_embedded")
+        if embedded and name in embedded:
+            return self._cached(name, lambda: tuple(embedded[name] or ()))
+        raise AttributeError(name)
+
+    def __getstate__(self) -> tuple:
+        return self._raw, self._key
+
+    def __setstate__(self, state: tuple) -> None:
+        self._raw, self._key = state
+        self._cache = None
+
+    def __getitem__(self, name: str) -> Any:
+        return self._raw[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._raw.get(name, default)
+
+    def get_custom_field(self, field_id: int) -> Optional[CustomFieldValue]:
+        index = self._cached(
+            "_custom_fields_index",
+            lambda: {f.field_id: f for f in self.custom_fields_values},
+        )
+        return index.get(field_id)
+
+    def to_dict(self) -> dict:
+        return self._raw
+
+    def to_model(self) -> Model:
+        """convert to compact record of amocrm_api.models"""
+        return MODELS[self._key].from_dict(self._raw)
+
+    def __repr__(self) -> str:
+        return f"LazyRecord(id={self._raw.get('id')!r})"
+
+
+class LazyPage(object):
+    """List page of `_get_entities`, objects are wrapped in LazyRecord on access"""
+
+    __slots__ = ("raw", "key")
+
+    def __init__(self, raw: dict, key: str) -> None:
+        self.raw = raw
+        self.key = key
+
+    @property
+    def _items(self) -> list:
+        return (self.raw.get("_embedded") or {}).get(self.key) or []
+
+    @property
+    def page(self) -> Optional[int]:
+        return self.raw.get("_page")
+
+    @property
+    def has_next(self) -> bool:
+        return "next" in (self.raw.get("_links") or {})
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> LazyRecord:
+        return LazyRecord(self._items[index], self.key)
+
+    def __iter__(self) -> Iterator[LazyRecord]:
+        key = self.key
+        for item in self._items:
+            yield LazyRecord(item, key)
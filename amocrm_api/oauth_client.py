@@ -1,10 +1,11 @@
 from json import JSONDecodeError
-from requests import Session, ConnectionError, ConnectTimeout, post
+from requests import Session, ConnectionError, ConnectTimeout, Response, post
 from typing import Optional, Union
 from urllib.parse import urlencode
 
 from .errors import AmoException
 from .base import BaseClient
+from .projection import Projection
 
 
 class AmoOAuthClient(BaseClient):
@@ -17,6 +18,7 @@ class AmoOAuthClient(BaseClient):
         client_secret: str,
         redirect_uri: str,
     ):
+        super().__init__()
         self._access_token = access_token
         self._refresh_token = refresh_token
         self.crm_url = crm_url if not crm_url.endswith('/') else crm_url[:-1]
@@ -43,34 +45,63 @@ class AmoOAuthClient(BaseClient):
         url: str,
         data: Optional[dict] = None,
         update_tokens: bool = False,
+        projection: Optional[Projection] = None,
     ) -> dict:
+        access_token = self.access_token
         try:
-            response = super()._send_api_request(method, url, data)
+            response = super()._send_api_request(
+                method, url, data, projection=projection
+            )
             return response
         except AmoException as e:
             if 'Jsonstatus: 401' in str(e) and not update_tokens:
-                self.update_tokens()
-                return self._send_api_request(method, url, data, True)
+                self._refresh_expired_token(access_token)
+                return self._send_api_request(
+                    method, url, data, True, projection=projection
+                )
+            raise
+
+    def _open_stream(
+        self, url: str, _connection_counter: int = 0, update_tokens: bool = False
+    ) -> Optional[Response]:
+        access_token = self.access_token
+        try:
+            return super()._open_stream(url, _connection_counter)
+        except AmoException as e:
+            if 'Jsonstatus: 401' in str(e) and not update_tokens:
+                self._refresh_expired_token(access_token)
+                return self._open_stream(url, _connection_counter, True)
             raise
 
+    def _refresh_expired_token(self, expired_token: str) -> None:
+        """refresh tokens once for all threads which got 401 with expired_token
+
+        Refresh token is single use, so threads wait for the lock and skip
+        refresh if other thread already replaced expired access token.
+        """
+        with self._session_lock:
+            if self.access_token == expired_token:
+                self.update_tokens()
+
     def update_session_auth_headers(self):
         self.update_session_params({'Authorization': f'Bearer {self.access_token}'})
 
     def update_tokens(self):
         url = f'{self.crm_url}/oauth2/access_token'
-        params = {
-            'client_id': self.client_id,
-            'client_secret': self.client_secret,
-            'grant_type': 'refresh_token',
-            'refresh_token': self.refresh_token,
-            'redirect_uri': self.redirect_uri,
-        }
-        r = post(url, json=params)
-        data = r.json()
-        if r.status_code > 204:
-            raise AmoException(data)
-        self._update_token_params(data['access_token'], data['refresh_token'])
-        self.update_session_auth_headers()
+        with self._session_lock:
+            params = {
+                'client_id': self.client_id,
+                'client_secret': self.client_secret,
+                'grant_type': 'refresh_token',
+                'refresh_token': self.refresh_token,
+                'redirect_uri': self.redirect_uri,
+            }
+            r = post(url, json=params)
+            data = r.json()
+            if r.status_code > 204:
+                raise AmoException(data)
+            self._update_token_params(data['access_token'], data['refresh_token'])
+            self.update_session_auth_headers()
 
     def _update_token_params(self, access_token: str, refresh_token: str):
         self._access_token = access_token
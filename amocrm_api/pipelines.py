@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+Key = Union[int, str]
+
+
+class PipelineResolver(object):
+    """Name/id/sort lookups of pipelines and statuses from one get_pipelines response
+
+    Args:
+        pipelines (list): get_pipelines()['_embedded']['pipelines']
+    """
+
+    def __init__(self, pipelines: list) -> None:
+        self.pipelines: Dict[int, dict] = {}
+        self.main_pipeline_id: Optional[int] = None
+        self._pipeline_ids: Dict[str, int] = {}
+        self._statuses: Dict[Tuple[int, int], dict] = {}
+        self._status_ids: Dict[Tuple[int, str], int] = {}
+        self._status_lists: Dict[int, List[dict]] = {}
+        for pipeline in pipelines:
+            pipeline_id = pipeline["id"]
+            self.pipelines[pipeline_id] = pipeline
+            self._pipeline_ids.setdefault(str(pipeline.get("name")).lower(), pipeline_id)
+            if pipeline.get("is_main"):
+                self.main_pipeline_id = pipeline_id
+            statuses = pipeline.get("_embedded", {}).get("statuses", [])
+            self._status_lists[pipeline_id] = sorted(
+                statuses, key=lambda status: status.get("sort") or 0
+            )
+            for status in statuses:
+                self._statuses[(pipeline_id, status["id"])] = status
+                name = str(status.get("name")).lower()
+                self._status_ids.setdefault((pipeline_id, name), status["id"])
+
+    def pipeline_id(self, pipeline: Key) -> int:
+        """return pipeline id by id or name (case insensitive)
+
+        Raises:
+            KeyError: if unknown pipeline
+        """
+        if isinstance(pipeline, int):
+            if pipeline in self.pipelines:
+                return pipeline
+        else:
+            pipeline_id = self._pipeline_ids.get(pipeline.lower())
+            if pipeline_id is not None:
+                return pipeline_id
+        raise KeyError(f"Unknown pipeline {pipeline!r}")
+
+    def pipeline_name(self, pipeline: Key) -> str:
+        return self.pipelines[self.pipeline_id(pipeline)].get("name")
+
+    def status(self, pipeline: Key, status: Key) -> dict:
+        """return status object by pipeline id/name and status id/name
+
+        Raises:
+            KeyError: if unknown pipeline or status
+        """
+        pipeline_id = self.pipeline_id(pipeline)
+        status_id = status
+        if not isinstance(status, int):
+            status_id = self._status_ids.get((pipeline_id, status.lower()))
+        try:
+            return self._statuses[(pipeline_id, status_id)]  # type: ignore
+        except KeyError:
+            raise KeyError(f"Unknown status {status!r} of pipeline {pipeline_id}")
+
+    def status_id(self, pipeline: Key, status: Key) -> int:
+        return self.status(pipeline, status)["id"]
+
+    def status_name(self, pipeline: Key, status: Key) -> str:
+        return self.status(pipeline, status).get("name")
+
+    def status_sort(self, pipeline: Key, status: Key) -> int:
+        return self.status(pipeline, status).get("sort")
+
+    def statuses(self, pipeline: Key) -> List[dict]:
+        """return statuses of pipeline ordered by sort"""
+        return list(self._status_lists[self.pipeline_id(pipeline)])
+
+    def statuses_by_pipeline(self) -> Dict[int, List[int]]:
+        """return {pipeline_id: status ids}"""
+        return {
+            pipeline_id: [status["id"] for status in statuses]
+            for pipeline_id, statuses in self._status_lists.items()
+        }
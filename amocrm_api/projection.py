@@ -0,0 +1,72 @@
+from typing import Optional
+
+
+class Projection(object):
+    """Slims parsed response objects: drops `_links` and unused fields
+
+    Args:
+        fields (Optional[list], optional): keys to keep, `id` is always kept.
+            Defaults to None - keep all keys.
+        drop_links (bool, optional): drop `_links` of object and of objects
+            in its `_embedded`. Defaults to True.
+        embedded_key (Optional[str], optional): key of list page like 'leads',
+            None if response is a single object. Defaults to None.
+    """
+
+    __slots__ = ("fields", "drop_links", "embedded_key")
+
+    def __init__(
+        self,
+        fields: Optional[list] = None,
+        drop_links: bool = True,
+        embedded_key: Optional[str] = None,
+    ) -> None:
+        self.fields = frozenset(fields) | {"id"} if fields else None
+        self.drop_links = drop_links
+        self.embedded_key = embedded_key
+
+    @classmethod
+    def create(
+        cls,
+        fields: Optional[list] = None,
+        drop_links: bool = False,
+        embedded_key: Optional[str] = None,
+    ) -> Optional["Projection"]:
+        """return projection or None if nothing to slim"""
+        if not fields and not drop_links:
+            return None
+        return cls(fields, drop_links, embedded_key)
+
+    def apply_entity(self, entity: dict) -> dict:
+        if self.fields is not None:
+            entity = {k: v for k, v in entity.items() if k in self.fields}
+        if self.drop_links:
+            entity.pop("_links", None)
+            embedded = entity.get("_embedded")
+            if embedded:
+                for value in embedded.values():
+                    if isinstance(value, list):
+                        for item in value:
+                            if isinstance(item, dict):
+                                item.pop("_links", None)
+        return entity
+
+    def apply(self, data: dict) -> dict:
+        """slim parsed response
+
+        Args:
+            data (dict): list page or single object
+
+        Returns:
+            dict: slimmed response, page `_links` are kept for pagination
+        """
+        if not data:
+            return data
+        if self.embedded_key is None:
+            return self.apply_entity(data)
+        embedded = data.get("_embedded")
+        if embedded and self.embedded_key in embedded:
+            embedded[self.embedded_key] = [
+                self.apply_entity(item) for item in embedded[self.embedded_key]
+            ]
+        return data
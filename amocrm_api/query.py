@@ -0,0 +1,159 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+RANGE_BOUNDS = ("from", "to")
+
+Param = Tuple[str, Any]
+
+
+def filter_params(filters: dict) -> List[Param]:
+    """return filter[..] query params of filters dict, filters are not changed
+
+    Keys like 'updated_at__from' and 'closed_at__to' are ranges
+    filter[updated_at][from] and filter[closed_at][to], empty range values are skipped,
+    other keys are filter[<key>].
+
+    Raises:
+        ValueError: if key is not a non-empty string
+    """
+    ranges: List[Param] = []
+    params: List[Param] = []
+    for key, value in filters.items():
+        if not isinstance(key, str) or not key:
+            raise ValueError(f"Invalid filter key {key!r}")
+        name, _, bound = key.rpartition("__")
+        if name and bound in RANGE_BOUNDS:
+            if value:
+                ranges.append((f"filter[{name}][{bound}]", value))
+        else:
+            params.append((f"filter[{key}]", value))
+    return ranges + params
+
+
+class QuerySpec(object):
+    """Immutable query of list request, static params are encoded once and
+    pages only swap `page` param, so one query can be shared by threads
+
+    Args:
+        path (str): path after /api/v4/ like 'leads' or 'leads/notes'
+        params (Iterable[Param], optional): static query params. Defaults to ().
+        limit (int, optional): rows per page, 1..250. Defaults to 250.
+
+    Raises:
+        ValueError: if limit is not in 1..250
+    """
+
+    __slots__ = ("path", "limit", "params", "encoded")
+
+    def __init__(self, path: str, params: Iterable[Param] = (), limit: int = 250) -> None:
+        if not 0 < limit <= 250:
+            raise ValueError(f"limit must be in 1..250, got {limit!r}")
+        params = tuple(params)
+        object.__setattr__(self, "path", path.strip("/"))
+        object.__setattr__(self, "limit", limit)
+        object.__setattr__(self, "params", params)
+        object.__setattr__(self, "encoded", urlencode(params, safe="[]"))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("QuerySpec is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("QuerySpec is immutable")
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        limit: int = 250,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+        order: Optional[dict] = None,
+    ) -> "QuerySpec":
+        """compile query of entities list like get_leads params"""
+        params: List[Param] = []
+        if with_params:
+            params.append(("with", ",".join(with_params)))
+        if filters:
+            params.extend(filter_params(filters))
+        if filter_ids:
+            params.extend(("filter[id][]", id_) for id_ in filter_ids)
+        if order:
+            params.extend((f"order[{k}]", v) for k, v in order.items())
+        return cls(path, params, limit)
+
+    @classmethod
+    def cached(
+        cls,
+        path: str,
+        limit: int = 250,
+        with_params: Optional[list] = None,
+        filters: Optional[dict] = None,
+        filter_ids: Optional[list] = None,
+        order: Optional[dict] = None,
+    ) -> "QuerySpec":
+        """same as create, compiled queries of static params (without
+        filters and filter_ids) are reused, the rest is compiled every call"""
+        if filters or filter_ids:
+            return cls.create(path, limit, with_params, filters, filter_ids, order)
+        try:
+            key = _freeze((path, limit, with_params, order))
+            return _create_cached(key)
+        except TypeError:
+            return cls.create(path, limit, with_params, order=order)
+
+    @property
+    def entity(self) -> str:
+        """key of objects in `_embedded`"""
+        return self.path.split("/")[-1]
+
+    @property
+    def signature(self) -> list:
+        """json serialisable identity of query for checkpoints"""
+        return [self.path, self.limit, self.encoded]
+
+    def url(self, base_url: str, page: int = 1) -> str:
+        url = f"{base_url}/api/v4/{self.path}?limit={self.limit}&page={page}"
+        return f"{url}&{self.encoded}" if self.encoded else url
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, QuerySpec):
+            return NotImplemented
+        return (self.path, self.limit, self.encoded) == (
+            other.path,
+            other.limit,
+            other.encoded,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.path, self.limit, self.encoded))
+
+    def __repr__(self) -> str:
+        return f"QuerySpec({self.path!r}, limit={self.limit!r}, {self.encoded!r})"
+
+
+def _freeze(value: Any) -> Any:
+    """hashable copy of value, every value is kept with its type,
+    so equal values like True, 1 and 1.0 are different keys"""
+    if isinstance(value, dict):
+        return (dict, tuple((_freeze(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(v) for v in value))
+    hash(value)
+    return (type(value), value)
+
+
+def _thaw(value: tuple) -> Any:
+    kind, items = value
+    if kind is dict:
+        return {_thaw(k): _thaw(v) for k, v in items}
+    if kind in (list, tuple):
+        return kind(_thaw(v) for v in items)
+    return items
+
+
+@lru_cache(maxsize=256)
+def _create_cached(key: tuple) -> QuerySpec:
+    path, limit, with_params, order = _thaw(key)
+    return QuerySpec.create(path, limit, with_params, order=order)
@@ -0,0 +1,234 @@
+from datetime import date, datetime, time, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .schema import DATE_TYPES, CustomField, CustomFieldSchema
+
+FieldsSpec = Union[Iterable[Union[int, str]], Dict[Union[int, str], str], None]
+
+
+def _compile_fields(
+    schema: CustomFieldSchema, fields: FieldsSpec
+) -> List[Tuple[CustomField, str]]:
+    if fields is None:
+        return [(field, field.name) for field in schema]
+    if isinstance(fields, dict):
+        return [(schema.get_field(key), column) for key, column in fields.items()]
+    return [(schema.get_field(key), schema.get_field(key).name) for key in fields]
+
+
+class RowDecoder(object):
+    """Flattens entities with custom_fields_values into rows
+
+    Field to column mapping is built once, every entity is decoded in a
+    single pass over its custom_fields_values.
+
+    Args:
+        schema (CustomFieldSchema): schema of entity type
+        columns (Optional[list], optional): top level keys like ['id', 'name']. Defaults to ['id'].
+        fields (FieldsSpec, optional): custom fields by id, code or name, or
+            dict {field: column name}. Defaults to None - all fields, named by field name.
+        enum_ids (bool, optional): return enum ids instead of enum values. Defaults to False.
+        separator (Optional[str], optional): join values of multi fields into str,
+            otherwise multi fields are tuples. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        schema: CustomFieldSchema,
+        columns: Optional[list] = None,
+        fields: FieldsSpec = None,
+        enum_ids: bool = False,
+        separator: Optional[str] = None,
+    ) -> None:
+        self.entity = schema.entity
+        self.columns: Tuple[str, ...] = tuple(columns or ["id"])
+        compiled = _compile_fields(schema, fields)
+        self.fields: Tuple[str, ...] = tuple(column for _, column in compiled)
+        self.header: Tuple[str, ...] = self.columns + self.fields
+        self.separator = separator
+        offset = len(self.columns)
+        self._slots: Dict[int, Tuple[int, str, bool]] = {}
+        for index, (field, _) in enumerate(compiled, offset):
+            value_key = "enum_id" if enum_ids and field.is_enum else "value"
+            self._slots[field.id] = (index, value_key, field.is_multi)
+
+    def decode(self, entity: Any) -> list:
+        """return row of entity, order of values is `header`
+
+        Args:
+            entity (Any): dict or object with `get` like LazyRecord
+        """
+        get = entity.get
+        row = [get(column) for column in self.columns]
+        row.extend([None] * len(self.fields))
+        slots = self._slots
+        separator = self.separator
+        for item in get("custom_fields_values") or ():
+            slot = slots.get(item.get("field_id"))
+            if slot is None:
+                continue
+            index, value_key, is_multi = slot
+            values = item.get("values") or ()
+            if is_multi:
+                decoded = tuple(v.get(value_key) for v in values)
+                if separator is not None:
+                    decoded = separator.join(str(v) for v in decoded)
+                row[index] = decoded
+            elif values:
+                row[index] = values[0].get(value_key)
+        return row
+
+    def decode_rows(self, entities: Union[dict, Iterable[Any]]) -> Iterator[list]:
+        """decode list page like get_leads() result or iterable of entities"""
+        if isinstance(entities, dict):
+            entities = entities.get("_embedded", {}).get(self.entity, [])
+        decode = self.decode
+        for entity in entities:
+            yield decode(entity)
+
+    def decode_dicts(self, entities: Union[dict, Iterable[Any]]) -> Iterator[dict]:
+        header = self.header
+        for row in self.decode_rows(entities):
+            yield dict(zip(header, row))
+
+    def decode_columns(self, entities: Union[dict, Iterable[Any]]) -> Dict[str, list]:
+        """return {column: list of values} for all entities"""
+        columns: List[list] = [[] for _ in self.header]
+        appends = [column.append for column in columns]
+        for row in self.decode_rows(entities):
+            for append, value in zip(appends, row):
+                append(value)
+        return dict(zip(self.header, columns))
+
+
+TRUE_STRINGS = frozenset(("1", "true", "yes", "y", "on", "да"))
+
+
+def _to_number(value: Any) -> Union[int, float]:
+    if isinstance(value, (int, float)):
+        return value
+    number = float(str(value).replace(" ", "").replace(",", "."))
+    return int(number) if number.is_integer() else number
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_STRINGS
+    return bool(value)
+
+
+def _to_timestamp(value: Any) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime.combine(value, time(), timezone.utc).timestamp())
+    return int(float(value))
+
+
+def _converter(field: CustomField) -> Callable[[Any], Any]:
+    if field.type == "numeric":
+        return _to_number
+    if field.type == "checkbox":
+        return _to_bool
+    if field.type in DATE_TYPES:
+        return _to_timestamp
+    return str
+
+
+class PayloadEncoder(object):
+    """Builds create/update objects with custom_fields_values from flat rows
+
+    Mapping is compiled once: every column gets its field id, value
+    converter and enum index, so encoding a row is a loop of dict lookups.
+
+    Args:
+        schema (CustomFieldSchema): schema of entity type
+        fields (Dict[str, Union[int, str]]): {column: custom field id, code or name}
+        columns (Optional[Dict[str, str]], optional): {column: top level key} copied
+            as is, like {'lead_id': 'id', 'title': 'name'}. Defaults to None.
+        separator (Optional[str], optional): split str values of multi fields. Defaults to None.
+        skip_none (bool, optional): skip None values, otherwise field is cleared. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        schema: CustomFieldSchema,
+        fields: Dict[str, Union[int, str]],
+        columns: Optional[Dict[str, str]] = None,
+        separator: Optional[str] = None,
+        skip_none: bool = True,
+    ) -> None:
+        self.columns = dict(columns or {})
+        self.separator = separator
+        self.skip_none = skip_none
+        self._plan: List[Tuple[str, int, bool, Callable[[Any], dict]]] = []
+        for column, key in fields.items():
+            field = schema.get_field(key)
+            self._plan.append(
+                (column, field.id, field.is_multi, self._value_encoder(field))
+            )
+
+    @staticmethod
+    def _value_encoder(field: CustomField) -> Callable[[Any], dict]:
+        if field.is_enum:
+            enums, enum_ids = field.enums, field.enum_ids
+
+            def encode_enum(value: Any) -> dict:
+                if value in enums:
+                    return {"enum_id": value}
+                enum_id = enum_ids.get(str(value).lower())
+                if enum_id is None:
+                    raise ValueError(f"Unknown enum {value!r} of field {field.id}")
+                return {"enum_id": enum_id}
+
+            return encode_enum
+        convert = _converter(field)
+        return lambda value: {"value": convert(value)}
+
+    def encode(self, row: dict) -> dict:
+        """return object for create/update methods
+
+        Raises:
+            ValueError: if value can not be converted or enum is unknown
+        """
+        payload = {
+            key: row[column] for column, key in self.columns.items() if column in row
+        }
+        custom_fields = []
+        for column, field_id, is_multi, encode_value in self._plan:
+            if column not in row:
+                continue
+            value = row[column]
+            if value is None or value == "":
+                if not self.skip_none:
+                    custom_fields.append({"field_id": field_id, "values": None})
+                continue
+            if isinstance(value, str) and is_multi and self.separator is not None:
+                value = [v.strip() for v in value.split(self.separator) if v.strip()]
+            try:
+                if isinstance(value, (list, tuple)):
+                    values = [encode_value(v) for v in value]
+                else:
+                    values = [encode_value(value)]
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{column}: {e}")
+            custom_fields.append({"field_id": field_id, "values": values})
+        if custom_fields:
+            payload["custom_fields_values"] = custom_fields
+        return payload
+
+    def encode_many(self, rows: Iterable[dict]) -> List[dict]:
+        encode = self.encode
+        return [encode(row) for row in rows]
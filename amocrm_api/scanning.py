@@ -0,0 +1,66 @@
+from typing import List, Optional, Tuple
+
+Window = Tuple[int, int]
+
+
+def split_window(start: int, end: int, parts: int) -> List[Window]:
+    """split [start, end] timestamps range into not overlapping windows
+
+    Args:
+        start (int): first timestamp, included
+        end (int): last timestamp, included
+        parts (int): max number of windows
+
+    Returns:
+        List[Window]: windows like [(start, a), (a + 1, b), ..., (c, end)]
+    """
+    parts = max(1, min(parts, end - start + 1))
+    size, extra = divmod(end - start + 1, parts)
+    windows = []
+    window_start = start
+    for i in range(parts):
+        window_end = window_start + size - 1 + (1 if i < extra else 0)
+        windows.append((window_start, window_end))
+        window_start = window_end + 1
+    return windows
+
+
+def window_filters(filters: dict, date_field: str, window: Window) -> dict:
+    """return copy of filters limited to window by date_field__from/__to"""
+    filters = dict(filters)
+    filters[f"{date_field}__from"], filters[f"{date_field}__to"] = window
+    return filters
+
+
+def uncovered_window(window: Window, dates: List[int]) -> Optional[Window]:
+    """return part of window which is not covered by first page of sorted objects
+
+    Page sorted by date ascending covers [start, last date], descending covers
+    [last date, end], last date is kept in result because its objects can
+    continue on next page.
+
+    Args:
+        window (Window): window of page
+        dates (List[int]): dates of page objects in response order
+
+    Returns:
+        Optional[Window]: rest of window, None if objects are not sorted by date
+    """
+    if not dates:
+        return None
+    start, end = window
+    pairs = list(zip(dates, dates[1:]))
+    if all(a <= b for a, b in pairs):
+        return max(start, dates[-1]), end
+    if all(a >= b for a, b in pairs):
+        return start, min(end, dates[-1])
+    return None
+
+
+def in_windows(date: Optional[int], windows: List[Window]) -> bool:
+    """check if object of date can be read again by windows, unknown date is in any window"""
+    if not windows:
+        return False
+    if date is None:
+        return True
+    return any(start <= date <= end for start, end in windows)
@@ -0,0 +1,161 @@
+from typing import Any, Dict, Iterable, Optional, Union
+
+ENUM_TYPES = frozenset(("select", "multiselect", "radiobutton", "category"))
+MULTI_TYPES = frozenset(("multiselect", "multitext", "category"))
+DATE_TYPES = frozenset(("date", "date_time", "birthday"))
+# types with one scalar `value`, other types like smart_address, items,
+# legal_entity or chained_list have compound values
+SCALAR_TYPES = DATE_TYPES | frozenset(
+    ("text", "textarea", "url", "streetaddress", "numeric", "checkbox")
+)
+SINGLE_VALUE_TYPES = SCALAR_TYPES | frozenset(("select", "radiobutton"))
+# api returns values of these fields as strings like "1500"
+NUMERIC_TYPES = frozenset(("numeric", "monetary", "price"))
+
+FieldKey = Union[int, str]
+
+
+class CustomField(object):
+    """Custom field description from custom fields api"""
+
+    __slots__ = ("id", "code", "name", "type", "enums", "enum_ids", "is_api_only")
+
+    def __init__(self, data: dict) -> None:
+        self.id: int = data["id"]
+        self.code: Optional[str] = data.get("code")
+        self.name: str = data.get("name") or ""
+        self.type: str = data.get("type") or ""
+        self.is_api_only: bool = bool(data.get("is_api_only"))
+        enums = data.get("enums") or ()
+        self.enums: Dict[int, str] = {e["id"]: e.get("value") for e in enums}
+        self.enum_ids: Dict[str, int] = {
+            str(e.get("value")).lower(): e["id"] for e in enums
+        }
+
+    @property
+    def is_enum(self) -> bool:
+        return self.type in ENUM_TYPES
+
+    @property
+    def is_multi(self) -> bool:
+        return self.type in MULTI_TYPES
+
+    def resolve_enum(self, value: Any) -> int:
+        """return enum id by enum value (case insensitive) or by enum id
+
+        Raises:
+            KeyError: if unknown enum
+        """
+        if isinstance(value, int) and value in self.enums:
+            return value
+        try:
+            return self.enum_ids[str(value).lower()]
+        except KeyError:
+            raise KeyError(f"Unknown enum {value!r} of field {self.id}")
+
+    def encode_value(self, value: Any) -> dict:
+        """return item of `values` for write payload"""
+        if self.is_enum:
+            return {"enum_id": self.resolve_enum(value)}
+        if isinstance(value, dict):
+            return value
+        return {"value": value}
+
+    def __repr__(self) -> str:
+        return f"CustomField({self.id!r}, {self.name!r}, {self.type!r})"
+
+
+class CustomFieldSchema(object):
+    """Index of custom fields of one entity type by id, code and name
+
+    Args:
+        entity (str): entity type like 'leads'
+        fields (Iterable[dict]): custom fields from all pages of _get_custom_fields
+    """
+
+    def __init__(self, entity: str, fields: Iterable[dict]) -> None:
+        self.entity = entity
+        self.by_id: Dict[int, CustomField] = {}
+        self.by_code: Dict[str, CustomField] = {}
+        self.by_name: Dict[str, CustomField] = {}
+        for data in fields:
+            field = CustomField(data)
+            self.by_id[field.id] = field
+            if field.code:
+                self.by_code[field.code.upper()] = field
+            self.by_name.setdefault(field.name.lower(), field)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __contains__(self, key: FieldKey) -> bool:
+        return self.find_field(key) is not None
+
+    def find_field(self, key: FieldKey) -> Optional[CustomField]:
+        """return field by id, code (like 'PHONE') or name (case insensitive)"""
+        if isinstance(key, int):
+            return self.by_id.get(key)
+        return self.by_code.get(key.upper()) or self.by_name.get(key.lower())
+
+    def get_field(self, key: FieldKey) -> CustomField:
+        """same as find_field
+
+        Raises:
+            KeyError: if unknown field
+        """
+        field = self.find_field(key)
+        if field is None:
+            raise KeyError(f"Unknown {self.entity} custom field {key!r}")
+        return field
+
+    def resolve_enum(self, key: FieldKey, value: Any) -> int:
+        return self.get_field(key).resolve_enum(value)
+
+    def enum_value(self, key: FieldKey, enum_id: int) -> Optional[str]:
+        return self.get_field(key).enums.get(enum_id)
+
+    def get_values(self, entity: dict, key: FieldKey) -> list:
+        """return `values` of field in entity object, empty list if not set"""
+        field_id = self.get_field(key).id
+        for item in entity.get("custom_fields_values") or ():
+            if item.get("field_id") == field_id:
+                return item.get("values") or []
+        return []
+
+    def get_value(self, entity: dict, key: FieldKey, default: Any = None) -> Any:
+        """return first value of field in entity object
+
+        Args:
+            entity (dict): entity object like lead
+            key (FieldKey): field id, code or name
+            default (Any, optional): returned if not set. Defaults to None.
+        """
+        values = self.get_values(entity, key)
+        return values[0].get("value", default) if values else default
+
+    def set_value(self, entity: dict, key: FieldKey, value: Any) -> dict:
+        """set field value in entity object, list value sets many values,
+        enum values are resolved by name, None clears the field
+
+        Returns:
+            dict: entity
+        """
+        field = self.get_field(key)
+        if value is None:
+            values: Optional[list] = None
+        elif isinstance(value, (list, tuple)):
+            values = [field.encode_value(v) for v in value]
+        else:
+            values = [field.encode_value(value)]
+        custom_fields = entity.get("custom_fields_values") or []
+        for item in custom_fields:
+            if item.get("field_id") == field.id:
+                item["values"] = values
+                break
+        else:
+            custom_fields.append({"field_id": field.id, "values": values})
+        entity["custom_fields_values"] = custom_fields
+        return entity
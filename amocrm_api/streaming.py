@@ -0,0 +1,36 @@
+from typing import Iterator, IO
+
+from .codec import JsonCodec
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+JSON_ERRORS: tuple = (ValueError,)
+if ijson is not None:
+    JSON_ERRORS = (ValueError, ijson.JSONError)
+
+
+def iter_embedded(fileobj: IO[bytes], key: str, codec: JsonCodec) -> Iterator[dict]:
+    """yield objects from `_embedded.<key>` while body is being read
+
+    Incremental parsing needs ijson, without it the body is read
+    and parsed at once by codec.
+
+    Args:
+        fileobj (IO[bytes]): readable body like response.raw
+        key (str): embedded key like 'leads'
+        codec (JsonCodec): fallback codec
+
+    Returns:
+        Iterator[dict]: embedded objects
+    """
+    if ijson is None:
+        raw_data = fileobj.read()
+        if not raw_data:
+            return
+        data = codec.loads(raw_data)
+        yield from data.get("_embedded", {}).get(key, [])
+        return
+    yield from ijson.items(fileobj, f"_embedded.{key}.item", use_float=True)
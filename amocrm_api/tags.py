@@ -0,0 +1,62 @@
+from typing import Callable, Dict, Iterable, Optional
+
+CREATE_CHUNK_SIZE = 250
+
+
+class TagRegistry(object):
+    """Tags of one entity type indexed by lower-cased name
+
+    Args:
+        entity_type (str): leads, contacts, companies or customers
+        loader (Callable[[], Iterable[dict]]): returns all tags of entity type
+        creator (Callable[[list], list]): creates tags like [{'name': ..}], returns created tags
+    """
+
+    def __init__(
+        self,
+        entity_type: str,
+        loader: Callable[[], Iterable[dict]],
+        creator: Callable[[list], list],
+    ) -> None:
+        self.entity_type = entity_type
+        self._loader = loader
+        self._creator = creator
+        self._by_name: Optional[Dict[str, dict]] = None
+
+    @property
+    def by_name(self) -> Dict[str, dict]:
+        if self._by_name is None:
+            self.refresh()
+        return self._by_name  # type: ignore
+
+    def refresh(self) -> None:
+        self._by_name = {str(tag["name"]).lower(): tag for tag in self._loader()}
+
+    def get(self, name: str) -> Optional[dict]:
+        return self.by_name.get(name.lower())
+
+    def get_id(self, name: str) -> Optional[int]:
+        tag = self.get(name)
+        return tag["id"] if tag else None
+
+    def get_or_create_many(self, names: Iterable[str]) -> Dict[str, int]:
+        """return {name: tag id}, missing tags are created in batched requests
+
+        Args:
+            names (Iterable[str]): tag names, compared case insensitive
+
+        Returns:
+            Dict[str, int]: ids by given names
+        """
+        by_name = self.by_name
+        names = list(names)
+        missing: Dict[str, str] = {}
+        for name in names:
+            key = name.lower()
+            if key not in by_name:
+                missing.setdefault(key, name)
+        objects = [{"name": name} for name in missing.values()]
+        for i in range(0, len(objects), CREATE_CHUNK_SIZE):
+            for tag in self._creator(objects[i : i + CREATE_CHUNK_SIZE]):
+                by_name[str(tag["name"]).lower()] = tag
+        return {name: by_name[name.lower()]["id"] for name in names}
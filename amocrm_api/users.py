@@ -0,0 +1,66 @@
+from time import monotonic
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class UserDirectory(object):
+    """Users of account indexed by id, email and group, reloaded after ttl
+
+    Args:
+        loader (Callable[[], list]): returns all users like get_users pages
+        ttl (float, optional): seconds before users are reloaded. Defaults to 3600.
+    """
+
+    def __init__(self, loader: Callable[[], list], ttl: float = 3600) -> None:
+        self._loader = loader
+        self.ttl = ttl
+        self._loaded_at: Optional[float] = None
+        self.by_id: Dict[int, dict] = {}
+        self.by_email: Dict[str, dict] = {}
+        self.by_group: Dict[int, List[dict]] = {}
+
+    def refresh(self) -> None:
+        by_id, by_email, by_group = {}, {}, {}  # type: ignore
+        for user in self._loader():
+            by_id[user["id"]] = user
+            if user.get("email"):
+                by_email[user["email"].lower()] = user
+            for group_id in self._group_ids(user):
+                by_group.setdefault(group_id, []).append(user)
+        self.by_id, self.by_email, self.by_group = by_id, by_email, by_group
+        self._loaded_at = monotonic()
+
+    @staticmethod
+    def _group_ids(user: dict) -> set:
+        group_ids = {g.get("id") for g in user.get("_embedded", {}).get("groups", [])}
+        rights_group = (user.get("rights") or {}).get("group_id")
+        if rights_group is not None:
+            group_ids.add(rights_group)
+        return group_ids
+
+    def _ensure_fresh(self) -> None:
+        if self._loaded_at is None or monotonic() - self._loaded_at > self.ttl:
+            self.refresh()
+
+    def get(self, user_id: int) -> Optional[dict]:
+        self._ensure_fresh()
+        return self.by_id.get(user_id)
+
+    def get_by_email(self, email: str) -> Optional[dict]:
+        self._ensure_fresh()
+        return self.by_email.get(email.lower())
+
+    def get_group(self, group_id: int) -> List[dict]:
+        self._ensure_fresh()
+        return list(self.by_group.get(group_id, []))
+
+    def resolve(self, ids: Iterable[int]) -> Dict[int, Optional[dict]]:
+        """return {user id: user or None if unknown}, no request per user"""
+        self._ensure_fresh()
+        by_id = self.by_id
+        return {user_id: by_id.get(user_id) for user_id in ids}
+
+    def resolve_names(self, ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        return {
+            user_id: user.get("name") if user else None
+            for user_id, user in self.resolve(ids).items()
+        }
@@ -0,0 +1,123 @@
+from numbers import Number
+from typing import Dict, Iterable, List, Optional
+
+from .schema import (
+    DATE_TYPES,
+    SCALAR_TYPES,
+    SINGLE_VALUE_TYPES,
+    CustomField,
+    CustomFieldSchema,
+)
+
+
+def _check_value(field: CustomField, value: dict) -> Optional[str]:
+    """check value of enum or scalar field, values of compound types are not checked"""
+    if not isinstance(value, dict):
+        return f"field {field.id}: value must be object, got {value!r}"
+    if field.is_enum:
+        enum_id = value.get("enum_id")
+        if enum_id is not None:
+            if enum_id not in field.enums:
+                return f"field {field.id}: unknown enum_id {enum_id}"
+        elif "value" in value:
+            if str(value["value"]).lower() not in field.enum_ids:
+                return f"field {field.id}: unknown enum value {value['value']!r}"
+        else:
+            return f"field {field.id}: enum_id or value is required"
+        return None
+    if field.type not in SCALAR_TYPES:
+        return None
+    if "value" not in value:
+        return f"field {field.id}: value is required"
+    item = value["value"]
+    if field.type == "numeric" and not isinstance(item, Number):
+        try:
+            float(str(item).replace(",", "."))
+        except ValueError:
+            return f"field {field.id}: numeric value expected, got {item!r}"
+    elif field.type == "checkbox" and not isinstance(item, bool):
+        return f"field {field.id}: bool value expected, got {item!r}"
+    elif field.type in DATE_TYPES and not isinstance(item, (int, str)):
+        return f"field {field.id}: timestamp expected, got {item!r}"
+    return None
+
+
+class PayloadValidator(object):
+    """Checks create/update objects against cached schema before sending
+
+    Args:
+        schema (Optional[CustomFieldSchema], optional): custom fields of entity type. Defaults to None.
+        pipeline_statuses (Optional[Dict[int, Iterable[int]]], optional): {pipeline_id: status ids},
+            checked for leads. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        schema: Optional[CustomFieldSchema] = None,
+        pipeline_statuses: Optional[Dict[int, Iterable[int]]] = None,
+    ) -> None:
+        self.schema = schema
+        self.pipeline_statuses = None
+        self.all_statuses: frozenset = frozenset()
+        if pipeline_statuses is not None:
+            self.pipeline_statuses = {
+                pipeline_id: frozenset(statuses)
+                for pipeline_id, statuses in pipeline_statuses.items()
+            }
+            self.all_statuses = frozenset().union(*self.pipeline_statuses.values())
+
+    def validate(self, obj: dict) -> List[str]:
+        """return list of errors of object, empty if valid"""
+        errors = []
+        if self.schema is not None:
+            errors.extend(self._validate_custom_fields(obj))
+        if self.pipeline_statuses is not None:
+            errors.extend(self._validate_status(obj))
+        return errors
+
+    def validate_many(self, objects: Iterable[dict]) -> Dict[int, List[str]]:
+        """return {index of object: errors} for invalid objects"""
+        result = {}
+        for index, obj in enumerate(objects):
+            errors = self.validate(obj)
+            if errors:
+                result[index] = errors
+        return result
+
+    def _validate_custom_fields(self, obj: dict) -> List[str]:
+        schema = self.schema
+        errors = []
+        for item in obj.get("custom_fields_values") or ():
+            key = item.get("field_id") or item.get("field_code")
+            field = schema.find_field(key) if key is not None else None  # type: ignore
+            if field is None:
+                errors.append(f"unknown {schema.entity} custom field {key!r}")  # type: ignore
+                continue
+            values = item.get("values")
+            if values is None:
+                continue
+            if not isinstance(values, list):
+                errors.append(f"field {field.id}: values must be list or null")
+                continue
+            if len(values) > 1 and field.type in SINGLE_VALUE_TYPES:
+                errors.append(f"field {field.id}: only one value allowed")
+            for value in values:
+                error = _check_value(field, value)
+                if error:
+                    errors.append(error)
+        return errors
+
+    def _validate_status(self, obj: dict) -> List[str]:
+        pipelines = self.pipeline_statuses
+        pipeline_id = obj.get("pipeline_id")
+        status_id = obj.get("status_id")
+        if pipeline_id is not None and pipeline_id not in pipelines:  # type: ignore
+            return [f"unknown pipeline_id {pipeline_id}"]
+        if status_id is None:
+            return []
+        if pipeline_id is not None:
+            if status_id not in pipelines[pipeline_id]:  # type: ignore
+                return [f"status_id {status_id} not in pipeline {pipeline_id}"]
+        elif status_id not in self.all_statuses:
+            return [f"unknown status_id {status_id}"]
+        return []
@@ -14,6 +14,11 @@ setup(
     install_requires=[
         "requests",
     ],
+    extras_require={
+        "orjson": ["orjson"],
+        "ujson": ["ujson"],
+        "stream": ["ijson"],
+    },
     description="Amocrm api wrapper v4",
     author="bzdvdn",
     author_email="bzdv.dn@gmail.com",
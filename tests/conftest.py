@@ -0,0 +1,91 @@
+import io
+import json
+from typing import Callable, List, Optional
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+from requests import Response, Session
+
+from amocrm_api.base import BaseClient
+
+CRM_URL = "https://example.amocrm.ru"
+
+
+def make_response(status_code: int, body: Optional[dict]) -> Response:
+    response = Response()
+    response.status_code = status_code
+    content = json.dumps(body).encode() if body is not None else b""
+    response._content = content
+    response.raw = io.BytesIO(content)
+    return response
+
+
+class FakeSession(Session):
+    """Session which answers with handler(method, path, query, body) -> (status, body)"""
+
+    def __init__(self, handler: Callable) -> None:
+        super().__init__()
+        self.handler = handler
+        self.calls: List[tuple] = []
+
+    def request(self, method, url, data=None, headers=None, stream=False, **kwargs):
+        parsed = urlparse(url)
+        query = parse_qsl(parsed.query)
+        body = json.loads(data) if data else None
+        self.calls.append((method, parsed.path, query, body))
+        return make_response(*self.handler(method, parsed.path, query, body))
+
+
+class FakeClient(BaseClient):
+    crm_url = CRM_URL
+
+    def __init__(self, handler: Callable) -> None:
+        super().__init__()
+        self.rate_limiter = None
+        self._handler = handler
+        self._session = self._init_session()
+
+    def _init_session(self, headers: Optional[dict] = None) -> Session:
+        return FakeSession(self._handler)
+
+
+def page_response(items: list, query: dict, key: str) -> tuple:
+    """answer like amoCRM list endpoint: page of items, 204 after last page"""
+    limit = int(query.get("limit", 250))
+    page = int(query.get("page", 1))
+    chunk = items[(page - 1) * limit : page * limit]
+    if not chunk:
+        return 204, None
+    links: dict = {"self": {"href": "self"}}
+    if page * limit < len(items):
+        links["next"] = {"href": "next"}
+    return 200, {"_page": page, "_links": links, "_embedded": {key: chunk}}
+
+
+def filter_items(items: list, query: list) -> list:
+    """apply filter[id][], filter[<field>][from|to] and order[<field>] of query"""
+    params = dict(query)
+    ids = {int(v) for k, v in query if k.startswith("filter[id]")}
+    if ids:
+        items = [item for item in items if item["id"] in ids]
+    for key, value in params.items():
+        if key.startswith("filter[") and key.endswith(("][from]", "][to]")):
+            field, bound = key[len("filter[") : -1].split("][")
+            if bound == "from":
+                items = [item for item in items if item[field] >= int(value)]
+            else:
+                items = [item for item in items if item[field] <= int(value)]
+    for key, direction in params.items():
+        if key.startswith("order["):
+            field = key[len("order[") : -1]
+            items = sorted(
+                items,
+                key=lambda item: (item[field], item["id"]),
+                reverse=direction == "desc",
+            )
+    return items
+
+
+@pytest.fixture
+def make_client() -> Callable[[Callable], FakeClient]:
+    return FakeClient
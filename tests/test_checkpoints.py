@@ -0,0 +1,89 @@
+import pytest
+
+from amocrm_api.checkpoints import Checkpoint, CheckpointStore, FileCheckpointStore
+from amocrm_api.errors import AmoException
+from amocrm_api.idset import IdSet
+
+from conftest import filter_items, page_response
+
+LEADS = [{"id": i, "updated_at": 1000 + i % 400, "created_at": 1000} for i in range(1, 1001)]
+
+
+class FailingHandler(object):
+    """answers leads lists, fails once on request number fail_at"""
+
+    def __init__(self, fail_at: int = 0) -> None:
+        self.fail_at = fail_at
+        self.requests = 0
+
+    def __call__(self, method, path, query, body):
+        self.requests += 1
+        if self.requests == self.fail_at:
+            return 502, {"title": "Bad Gateway"}
+        return page_response(filter_items(LEADS, query), dict(query), "leads")
+
+
+def test_iteration_resumes_from_next_page(make_client, tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    client = make_client(FailingHandler(fail_at=3))
+    first = []
+    with pytest.raises(AmoException):
+        for lead in client.iter_leads(limit=100, checkpoint=Checkpoint(FileCheckpointStore(path), "leads")):
+            first.append(lead["id"])
+    assert first == list(range(1, 201))
+
+    client = make_client(FailingHandler())
+    checkpoint = Checkpoint(FileCheckpointStore(path), "leads")
+    rest = [lead["id"] for lead in client.iter_leads(limit=100, checkpoint=checkpoint)]
+    assert rest == list(range(201, 1001))
+    assert dict(client._session.calls[0][2])["page"] == "3"
+    assert checkpoint.store.load("leads") is None
+
+
+def test_checkpoint_of_other_query_is_rejected(make_client):
+    checkpoint = Checkpoint(CheckpointStore(), "leads")
+    checkpoint.save(["leads", 100, ""], page=2)
+    client = make_client(FailingHandler())
+    with pytest.raises(ValueError):
+        next(client.iter_leads(limit=50, checkpoint=checkpoint))
+
+
+def test_scan_resumes_without_repeating_objects(make_client, tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    client = make_client(FailingHandler(fail_at=4))
+    first = []
+    with pytest.raises(AmoException):
+        checkpoint = Checkpoint(FileCheckpointStore(path), "scan")
+        for lead in client.scan_leads(1000, 1399, windows=2, max_workers=2, checkpoint=checkpoint):
+            first.append(lead["id"])
+    assert first
+
+    client = make_client(FailingHandler())
+    checkpoint = Checkpoint(FileCheckpointStore(path), "scan")
+    rest = [lead["id"] for lead in client.scan_leads(1000, 1399, windows=2, max_workers=2, checkpoint=checkpoint)]
+    assert not set(first) & set(rest)
+    assert sorted(first + rest) == list(range(1, 1001))
+    assert checkpoint.store.load("scan") is None
+
+
+def test_iteration_skips_objects_shifted_to_resumed_page(make_client):
+    checkpoint = Checkpoint(CheckpointStore(), "leads")
+    checkpoint.save(["leads", 100, ""], page=3, last_id=200)
+    # two leads added before position move 199 and 200 to page 3
+    leads = [{"id": i, "updated_at": 999, "created_at": 999} for i in (2001, 2002)] + LEADS
+    client = make_client(lambda method, path, query, body: page_response(leads, dict(query), "leads"))
+    rest = [lead["id"] for lead in client.iter_leads(limit=100, checkpoint=checkpoint)]
+    assert rest == list(range(201, 1001))
+
+
+def test_scan_checkpoint_keeps_only_boundary_ids(make_client):
+    store = CheckpointStore()
+    saved = []
+    save = store.save
+    store.save = lambda key, state: saved.append(state) or save(key, state)
+    client = make_client(FailingHandler())
+    checkpoint = Checkpoint(store, "scan")
+    leads = [lead["id"] for lead in client.scan_leads(1000, 1399, windows=2, max_workers=2, checkpoint=checkpoint)]
+    assert sorted(leads) == list(range(1, 1001))
+    assert saved
+    assert max(len(IdSet.loads(state["seen"])) for state in saved) < len(leads) / 2
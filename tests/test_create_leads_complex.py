@@ -0,0 +1,50 @@
+import pytest
+
+from amocrm_api.models import Lead
+
+
+def complex_handler(method, path, query, body):
+    assert path == "/api/v4/leads/complex"
+    results = [
+        {"id": 1000 + i, "contact_id": 2000 + i, "company_id": None, "request_id": [obj["request_id"]], "merged": False}
+        for i, obj in enumerate(body)
+    ]
+    return 200, results
+
+
+def sent_request_ids(client) -> list:
+    return [obj["request_id"] for _, _, _, body in client._session.calls for obj in body]
+
+
+def test_results_follow_objects_order_across_chunks(make_client):
+    client = make_client(complex_handler)
+    objects = [{"name": f"lead {i}"} for i in range(120)]
+    results = client.create_leads_complex(objects, max_workers=3)
+    assert len(client._session.calls) == 3
+    assert [r["request_id"] for r in results] == [[str(i)] for i in range(120)]
+    assert all("request_id" not in obj for obj in objects)
+
+
+def test_generated_request_ids_do_not_collide_with_caller_ids(make_client):
+    client = make_client(complex_handler)
+    objects = [{"name": "a", "request_id": "1"}, {"name": "b"}, Lead(name="c")]
+    results = client.create_leads_complex(objects)
+    request_ids = sent_request_ids(client)
+    assert request_ids[0] == "1"
+    assert len(set(request_ids)) == 3
+    assert [r["request_id"] for r in results] == [[request_id] for request_id in request_ids]
+    assert results[0]["id"] != results[1]["id"]
+
+
+def test_duplicate_caller_request_ids_are_rejected(make_client):
+    client = make_client(complex_handler)
+    with pytest.raises(ValueError):
+        client.create_leads_complex([{"name": "a", "request_id": "x"}, {"name": "b", "request_id": "x"}])
+    assert client._session.calls == []
+
+
+def test_missing_results_are_none(make_client):
+    client = make_client(lambda method, path, query, body: (200, complex_handler(method, path, query, body)[1][:1]))
+    results = client.create_leads_complex([{"name": "a"}, {"name": "b"}])
+    assert results[0]["id"] == 1000
+    assert results[1] is None
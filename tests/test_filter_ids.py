@@ -0,0 +1,54 @@
+from urllib.parse import urlencode
+
+from amocrm_api.base import FILTER_IDS_QUERY_LENGTH, MAX_LIMIT, split_filter_ids
+
+from conftest import filter_items, page_response
+
+LEADS = [{"id": i, "name": f"lead {i}"} for i in range(1, 1001)]
+
+
+def leads_handler(method, path, query, body):
+    items = filter_items(LEADS, query)
+    return page_response(items, dict(query), "leads")
+
+
+def ids_query_length(ids: list) -> int:
+    return len(urlencode([("filter[id][]", id_) for id_ in ids], safe="[]"))
+
+
+def test_split_filter_ids_keeps_short_list_in_one_chunk():
+    assert split_filter_ids([1, 2, 3]) == [[1, 2, 3]]
+    assert split_filter_ids([]) == [[]]
+
+
+def test_split_filter_ids_caps_chunk_at_page_size():
+    ids = list(range(10 ** 9, 10 ** 9 + 1000))
+    chunks = split_filter_ids(ids)
+    assert [len(chunk) for chunk in chunks] == [MAX_LIMIT] * 4
+    assert [id_ for chunk in chunks for id_ in chunk] == ids
+
+
+def test_split_filter_ids_fits_url_budget():
+    ids = [10 ** 18 + i for i in range(1000)]
+    chunks = split_filter_ids(ids)
+    assert len(chunks) > 4
+    assert all(ids_query_length(chunk) <= FILTER_IDS_QUERY_LENGTH for chunk in chunks)
+    assert [id_ for chunk in chunks for id_ in chunk] == ids
+    chunks = split_filter_ids(list(range(100)), max_length=100)
+    assert all(ids_query_length(chunk) <= 100 for chunk in chunks)
+
+
+def test_get_leads_merges_chunks_with_one_request_per_chunk(make_client):
+    client = make_client(leads_handler)
+    ids = list(range(1, 1001)) + [1, 2, 3]
+    leads = client.get_leads(filter_ids=ids)["_embedded"]["leads"]
+    assert sorted(lead["id"] for lead in leads) == list(range(1, 1001))
+    assert len(client._session.calls) == 5
+
+
+def test_iter_leads_reads_chunks_one_by_one(make_client):
+    client = make_client(leads_handler)
+    ids = list(range(1000, 0, -1))
+    leads = list(client.iter_leads(filter_ids=ids))
+    assert sorted(lead["id"] for lead in leads) == list(range(1, 1001))
+    assert len(client._session.calls) == 4
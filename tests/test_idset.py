@@ -0,0 +1,51 @@
+import random
+
+from amocrm_api.idset import MERGE_THRESHOLD, IdSet
+
+
+def test_membership_with_buffer_and_sorted_part():
+    ids = IdSet([5, 3, 5, 1])
+    assert 3 in ids and 4 not in ids
+    assert list(ids) == [1, 3, 5]
+    many = IdSet(range(0, 3 * MERGE_THRESHOLD, 3))
+    many.add(1)
+    assert 1 in many and 3 * (MERGE_THRESHOLD - 1) in many and 2 not in many
+    assert len(many) == MERGE_THRESHOLD + 1
+
+
+def test_round_trip_keeps_ids():
+    random.seed(3)
+    values = {random.randint(-(2 ** 62), 2 ** 62) for _ in range(10000)}
+    values |= {0, 1, -1, 2 ** 63 - 1, -(2 ** 63)}
+    ids = IdSet(values)
+    restored = IdSet.loads(ids.dumps())
+    assert restored == ids
+    assert list(restored) == sorted(values)
+    assert IdSet.from_bytes(ids.to_bytes()) == ids
+
+
+def test_negative_ids():
+    ids = IdSet([-5, 7, -1000000, 0])
+    assert -5 in ids and -6 not in ids
+    assert list(IdSet.loads(ids.dumps())) == [-1000000, -5, 0, 7]
+
+
+def test_empty_set_round_trip():
+    assert IdSet.loads(IdSet().dumps()) == IdSet()
+    assert len(IdSet.loads("")) == 0
+
+
+def test_union_merges_without_duplicates():
+    first = IdSet(range(0, 100, 2))
+    second = IdSet(range(0, 100, 3))
+    both = first | second
+    assert list(both) == sorted(set(range(0, 100, 2)) | set(range(0, 100, 3)))
+    assert list(first.union([1, -1])) == [-1, 0, 1] + list(range(2, 100, 2))
+    assert len(first) == 50
+    first.update(second)
+    assert first == both
+
+
+def test_sorted_ids_are_compact():
+    ids = IdSet(range(30000000, 30100000))
+    assert len(ids.to_bytes()) == len(ids) + 3
@@ -0,0 +1,74 @@
+import pytest
+
+from amocrm_api.mirror import SqliteMirror
+
+from conftest import filter_items, page_response
+
+CUSTOM_FIELDS = [
+    {"id": 10, "name": "Budget", "code": None, "type": "numeric", "enums": None},
+    {"id": 11, "name": "Source", "code": "SOURCE", "type": "text", "enums": None},
+    {
+        "id": 12,
+        "name": "Color",
+        "code": None,
+        "type": "select",
+        "enums": [{"id": 121, "value": "Red"}, {"id": 122, "value": "Blue"}],
+    },
+]
+
+
+def custom_fields(budget: str, source: str, color_id: int) -> list:
+    color = {121: "Red", 122: "Blue"}[color_id]
+    return [
+        {"field_id": 10, "field_type": "numeric", "values": [{"value": budget}]},
+        {"field_id": 11, "field_type": "text", "values": [{"value": source}]},
+        {"field_id": 12, "field_type": "select", "values": [{"value": color, "enum_id": color_id}]},
+    ]
+
+
+LEADS = [
+    {"id": 1, "status_id": 142, "price": 0, "updated_at": 1001, "custom_fields_values": custom_fields("25", "25", 121)},
+    {"id": 2, "status_id": 143, "price": 300, "updated_at": 1002, "custom_fields_values": custom_fields("1500.5", "ads", 122)},
+    {"id": 3, "status_id": 142, "price": 700, "updated_at": 1003, "custom_fields_values": custom_fields("7", "ads", 121)},
+]
+
+
+def handler(method, path, query, body):
+    if path.endswith("/custom_fields"):
+        return page_response(CUSTOM_FIELDS, dict(query), "custom_fields")
+    return page_response(filter_items(LEADS, query), dict(query), "leads")
+
+
+@pytest.fixture
+def local_query(make_client):
+    mirror = SqliteMirror(make_client(handler))
+    mirror.sync_entity("leads")
+    yield mirror.query
+    mirror.close()
+
+
+def ids(query, filters: dict) -> list:
+    return [lead["id"] for lead in query.select("leads", filters)]
+
+
+def test_numeric_field_equality_and_lists(local_query):
+    assert ids(local_query, {"custom_fields_values": {"Budget": 25}}) == [1]
+    assert ids(local_query, {"custom_fields_values": {"Budget": "25"}}) == [1]
+    assert ids(local_query, {"custom_fields_values": {"Budget": [7, 1500.5]}}) == [2, 3]
+
+
+def test_numeric_field_range(local_query):
+    filters = {"custom_fields_values": {"Budget": {"from": 8, "to": "2000"}}}
+    assert ids(local_query, filters) == [1, 2]
+
+
+def test_text_and_enum_fields(local_query):
+    assert ids(local_query, {"custom_fields_values": {"SOURCE": "25"}}) == [1]
+    assert ids(local_query, {"custom_fields_values": {"Color": "Blue"}}) == [2]
+    assert ids(local_query, {"custom_fields_values": {"Color": [121]}}) == [1, 3]
+
+
+def test_empty_range_bounds_are_skipped(local_query):
+    assert ids(local_query, {"updated_at__from": None, "updated_at__to": 1002}) == [1, 2]
+    assert ids(local_query, {"price__from": None}) == [1, 2, 3]
+    assert local_query.count("leads", {"status_id": 142, "updated_at__to": None}) == 2
@@ -0,0 +1,49 @@
+import json
+import time
+from unittest import mock
+
+from amocrm_api.concurrency import run_concurrently
+from amocrm_api.oauth_client import AmoOAuthClient
+
+
+class FakeResponse(object):
+    def __init__(self, status_code: int, body: dict) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.content = json.dumps(body).encode()
+
+    def json(self) -> dict:
+        return self.body
+
+
+def test_concurrent_401_refreshes_tokens_once():
+    refresh_tokens = []
+
+    def fake_post(url, json):
+        refresh_tokens.append(json["refresh_token"])
+        time.sleep(0.05)
+        if json["refresh_token"] != "refresh-0":
+            return FakeResponse(400, {"hint": "Token has been revoked"})
+        return FakeResponse(200, {"access_token": "access-1", "refresh_token": "refresh-1"})
+
+    def fake_request(session, method, url, **kwargs):
+        if session.headers["Authorization"] == "Bearer access-0":
+            time.sleep(0.01)
+            return FakeResponse(401, {"type": "Json", "status": 401})
+        return FakeResponse(200, {"url": url})
+
+    with mock.patch("amocrm_api.oauth_client.post", fake_post), mock.patch(
+        "requests.Session.request", fake_request
+    ):
+        client = AmoOAuthClient(
+            "access-0", "refresh-0", "https://example.amocrm.ru", "id", "secret", "uri"
+        )
+        client.rate_limiter = None
+        urls = [(f"https://example.amocrm.ru/api/v4/leads/{i}",) for i in range(16)]
+        results = run_concurrently(
+            lambda url: client._send_api_request("get", url), urls, 8
+        )
+
+    assert [r["url"] for r in results] == [url for url, in urls]
+    assert refresh_tokens == ["refresh-0"]
+    assert client.tokens == {"access_token": "access-1", "refresh_token": "refresh-1"}
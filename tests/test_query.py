@@ -0,0 +1,47 @@
+import pytest
+
+from amocrm_api.query import QuerySpec, filter_params
+
+
+def test_filter_params_maps_ranges_and_keeps_filters():
+    filters = {"closed_at__to": 20, "updated_at__from": 10, "created_at__from": None, "status_id": 142}
+    assert filter_params(filters) == [
+        ("filter[closed_at][to]", 20),
+        ("filter[updated_at][from]", 10),
+        ("filter[status_id]", 142),
+    ]
+    assert filters == {"closed_at__to": 20, "updated_at__from": 10, "created_at__from": None, "status_id": 142}
+
+
+def test_query_url_swaps_only_page():
+    query = QuerySpec.create("leads", 50, ["contacts"], {"closed_at__to": 5}, [1, 2], {"id": "asc"})
+    assert query.url("https://example.amocrm.ru", 3) == (
+        "https://example.amocrm.ru/api/v4/leads?limit=50&page=3&with=contacts"
+        "&filter[closed_at][to]=5&filter[id][]=1&filter[id][]=2&order[id]=asc"
+    )
+    with pytest.raises(AttributeError):
+        query.limit = 10
+
+
+@pytest.mark.parametrize("first, second", [(1, True), (1, 1.0), (0, False), ([1], (1,))])
+def test_cached_query_keeps_value_types_apart(first, second):
+    first_query = QuerySpec.cached("leads", order={"id": first})
+    second_query = QuerySpec.cached("leads", order={"id": second})
+    assert first_query == QuerySpec.create("leads", order={"id": first})
+    assert second_query == QuerySpec.create("leads", order={"id": second})
+
+
+def test_cached_query_reuses_only_static_queries():
+    assert QuerySpec.cached("leads", 50, ["contacts"], order={"id": "asc"}) is QuerySpec.cached(
+        "leads", 50, ["contacts"], order={"id": "asc"}
+    )
+    filters = {"statuses": 142}
+    assert QuerySpec.cached("leads", filters=filters) is not QuerySpec.cached("leads", filters=filters)
+    assert QuerySpec.cached("leads", filter_ids=[1, 2]) == QuerySpec.create("leads", filter_ids=[1, 2])
+    assert QuerySpec.cached("leads", order={"id": {1, 2}}) == QuerySpec.create("leads", order={"id": {1, 2}})
+
+
+@pytest.mark.parametrize("limit", [0, 251])
+def test_query_rejects_limit_out_of_range(limit):
+    with pytest.raises(ValueError):
+        QuerySpec.create("leads", limit)
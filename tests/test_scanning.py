@@ -0,0 +1,122 @@
+import random
+
+import pytest
+
+from amocrm_api.checkpoints import Checkpoint, FileCheckpointStore
+from amocrm_api.errors import AmoException
+from amocrm_api.scanning import split_window, uncovered_window
+
+from conftest import filter_items, page_response
+
+random.seed(7)
+LEADS = [
+    {"id": i, "updated_at": random.randint(1000, 1999), "created_at": 1000}
+    for i in range(1, 3001)
+]
+EVENTS = sorted(
+    (
+        {"id": f"01pz58t6p04ymg{i:012d}", "created_at": 1000 + i // 3, "type": "lead_added"}
+        for i in range(900)
+    ),
+    key=lambda event: event["created_at"],
+    reverse=True,
+)
+
+
+def handler(method, path, query, body):
+    entity = path.rstrip("/").split("/")[-1]
+    data = {"leads": LEADS, "events": EVENTS}[entity]
+    return page_response(filter_items(data, query), dict(query), entity)
+
+
+class CountingHandler(object):
+    """handler which counts objects sent in responses"""
+
+    def __init__(self) -> None:
+        self.rows = 0
+
+    def __call__(self, method, path, query, body):
+        status, data = handler(method, path, query, body)
+        if data is not None:
+            self.rows += sum(len(items) for items in data["_embedded"].values())
+        return status, data
+
+
+def test_split_window_covers_range_without_overlap():
+    assert split_window(0, 9, 3) == [(0, 3), (4, 6), (7, 9)]
+    assert split_window(5, 6, 4) == [(5, 5), (6, 6)]
+
+
+def test_uncovered_window_follows_page_order():
+    assert uncovered_window((0, 100), [1, 5, 20]) == (20, 100)
+    assert uncovered_window((0, 100), [90, 50, 30]) == (0, 30)
+    assert uncovered_window((0, 100), [5, 1, 20]) is None
+    assert uncovered_window((0, 100), []) is None
+
+
+def test_scan_returns_every_object_once(make_client):
+    client = make_client(handler)
+    leads = list(client.scan_leads(1000, 1999, max_workers=4))
+    assert sorted(lead["id"] for lead in leads) == [lead["id"] for lead in LEADS]
+
+
+def test_scan_reads_dense_window_rest_only(make_client):
+    counter = CountingHandler()
+    client = make_client(counter)
+    leads = list(client.scan_leads(1000, 1999, windows=1, max_workers=4))
+    assert len(leads) == len(LEADS)
+    # objects of first pages are read again only for their last second
+    assert counter.rows < len(LEADS) * 1.01
+    assert len(client._session.calls) <= len(LEADS) // 250 + 2
+
+
+def test_scan_events_with_descending_pages(make_client):
+    counter = CountingHandler()
+    client = make_client(counter)
+    events = list(client.scan_events(1000, 1299, max_workers=2))
+    assert sorted(event["id"] for event in events) == sorted(e["id"] for e in EVENTS)
+    assert counter.rows < len(EVENTS) * 1.01
+
+
+MANY_EVENTS = [
+    {"id": f"01pz58t6p04ymg{i:012d}", "created_at": 1000 + i // 10, "type": "lead_added"}
+    for i in range(5000)
+]
+
+
+class EventsHandler(object):
+    """answers events lists, fails once on request number fail_at"""
+
+    def __init__(self, fail_at: int = 0) -> None:
+        self.fail_at = fail_at
+        self.requests = 0
+
+    def __call__(self, method, path, query, body):
+        self.requests += 1
+        if self.requests == self.fail_at:
+            return 502, {"title": "Bad Gateway"}
+        return page_response(filter_items(MANY_EVENTS, query), dict(query), "events")
+
+
+def test_scan_events_deduplicates_str_ids(make_client):
+    client = make_client(EventsHandler())
+    events = list(client.scan_events(1000, 1499, windows=1))
+    assert sorted(event["id"] for event in events) == [e["id"] for e in MANY_EVENTS]
+
+
+def test_scan_events_resumes_from_checkpoint(make_client, tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    client = make_client(EventsHandler(fail_at=6))
+    first = []
+    with pytest.raises(AmoException):
+        checkpoint = Checkpoint(FileCheckpointStore(path), "events")
+        for event in client.scan_events(1000, 1499, windows=2, max_workers=2, checkpoint=checkpoint):
+            first.append(event["id"])
+    assert first
+
+    client = make_client(EventsHandler())
+    checkpoint = Checkpoint(FileCheckpointStore(path), "events")
+    rest = [e["id"] for e in client.scan_events(1000, 1499, windows=2, max_workers=2, checkpoint=checkpoint)]
+    assert not set(first) & set(rest)
+    assert sorted(first + rest) == [e["id"] for e in MANY_EVENTS]
+    assert checkpoint.store.load("events") is None
@@ -0,0 +1,86 @@
+from amocrm_api.checkpoints import Checkpoint, CheckpointStore
+
+from conftest import filter_items, page_response
+
+
+def make_leads() -> list:
+    # 130 leads share second 1005, more than two pages of 50
+    leads = [{"id": i, "updated_at": 1000 + i % 10} for i in range(1, 101)]
+    leads += [{"id": i, "updated_at": 1005} for i in range(101, 221)]
+    return leads
+
+
+class LeadsHandler(object):
+    def __init__(self, leads: list) -> None:
+        self.leads = leads
+        self.on_request = None
+
+    def __call__(self, method, path, query, body):
+        if self.on_request is not None:
+            self.on_request()
+        return page_response(filter_items(self.leads, query), dict(query), "leads")
+
+
+def test_cursor_ties_larger_than_page(make_client):
+    leads = make_leads()
+    client = make_client(LeadsHandler(leads))
+    result = list(client.iter_by_updated_at("leads", limit=50))
+    ids = [lead["id"] for lead in result]
+    assert sorted(ids) == [lead["id"] for lead in leads]
+    dates = [lead["updated_at"] for lead in result]
+    assert dates == sorted(dates)
+
+
+def test_range_and_fields(make_client):
+    leads = make_leads()
+    client = make_client(LeadsHandler(leads))
+    result = list(
+        client.iter_by_updated_at("leads", 1003, 1005, limit=50, fields=["id"])
+    )
+    expected = [lead["id"] for lead in leads if 1003 <= lead["updated_at"] <= 1005]
+    assert sorted(lead["id"] for lead in result) == sorted(expected)
+    assert set(result[0]) == {"id", "updated_at"}
+
+
+def test_object_updated_during_iteration_is_returned_again(make_client):
+    leads = make_leads()
+    handler = LeadsHandler(leads)
+    client = make_client(handler)
+
+    def touch_first_lead():
+        leads[0]["updated_at"] = 2000
+        handler.on_request = None
+
+    iterator = client.iter_by_updated_at("leads", limit=50)
+    first = [next(iterator)["id"] for _ in range(60)]
+    handler.on_request = touch_first_lead
+    rest = [lead["id"] for lead in iterator]
+    assert 1 in first
+    assert rest[-1] == 1
+    assert sorted(set(first + rest)) == [lead["id"] for lead in leads]
+
+
+def test_checkpoint_keeps_cursor_for_next_run(make_client):
+    leads = make_leads()
+    store = CheckpointStore()
+    client = make_client(LeadsHandler(leads))
+    first = list(client.iter_by_updated_at("leads", limit=50, checkpoint=Checkpoint(store, "sync")))
+    assert len(first) == len(leads)
+    assert store.load("sync")["cursor"] == 1009
+
+    leads.append({"id": 500, "updated_at": 1009})
+    leads.append({"id": 501, "updated_at": 1100})
+    second = list(client.iter_by_updated_at("leads", limit=50, checkpoint=Checkpoint(store, "sync")))
+    assert [lead["id"] for lead in second] == [500, 501]
+
+
+def test_resume_after_interruption(make_client):
+    leads = make_leads()
+    store = CheckpointStore()
+    client = make_client(LeadsHandler(leads))
+    iterator = client.iter_by_updated_at("leads", limit=50, checkpoint=Checkpoint(store, "sync"))
+    first = [next(iterator)["id"] for _ in range(100)]
+    iterator.close()
+    rest = list(client.iter_by_updated_at("leads", limit=50, checkpoint=Checkpoint(store, "sync")))
+    ids = first + [lead["id"] for lead in rest]
+    assert sorted(set(ids)) == [lead["id"] for lead in leads]
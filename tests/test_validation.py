@@ -0,0 +1,83 @@
+from amocrm_api.schema import CustomFieldSchema
+from amocrm_api.validation import PayloadValidator
+
+FIELDS = [
+    {"id": 1, "name": "Budget", "type": "numeric"},
+    {"id": 2, "name": "Agree", "type": "checkbox"},
+    {"id": 3, "name": "Birthday", "type": "birthday"},
+    {"id": 4, "name": "Color", "type": "select", "enums": [{"id": 41, "value": "Red"}]},
+    {"id": 5, "name": "Tags", "type": "multiselect", "enums": [{"id": 51, "value": "A"}, {"id": 52, "value": "B"}]},
+    {"id": 6, "name": "Phone", "code": "PHONE", "type": "multitext"},
+    {"id": 7, "name": "Address", "type": "smart_address"},
+    {"id": 8, "name": "Items", "type": "items"},
+    {"id": 9, "name": "Requisites", "type": "legal_entity"},
+    {"id": 10, "name": "Product", "type": "chained_list"},
+    {"id": 11, "name": "Note", "type": "text"},
+]
+
+
+def errors(*custom_fields_values) -> list:
+    validator = PayloadValidator(CustomFieldSchema("leads", FIELDS))
+    return validator.validate({"custom_fields_values": list(custom_fields_values)})
+
+
+def test_scalar_and_enum_values():
+    assert errors(
+        {"field_id": 1, "values": [{"value": "1500.5"}]},
+        {"field_id": 2, "values": [{"value": True}]},
+        {"field_id": 3, "values": [{"value": 1609459200}]},
+        {"field_id": 4, "values": [{"value": "red"}]},
+        {"field_id": 5, "values": [{"enum_id": 51}, {"enum_id": 52}]},
+        {"field_code": "PHONE", "values": [{"value": "+7999", "enum_code": "WORK"}, {"value": "+7998"}]},
+    ) == []
+    assert errors(
+        {"field_id": 1, "values": [{"value": "many"}]},
+        {"field_id": 2, "values": [{"value": "yes"}]},
+        {"field_id": 4, "values": [{"enum_id": 99}]},
+        {"field_id": 11, "values": [{"value": "a"}, {"value": "b"}]},
+        {"field_id": 11, "values": [{"enum_id": 1}]},
+    ) == [
+        "field 1: numeric value expected, got 'many'",
+        "field 2: bool value expected, got 'yes'",
+        "field 4: unknown enum_id 99",
+        "field 11: only one value allowed",
+        "field 11: value is required",
+    ]
+
+
+def test_compound_types_with_several_values_are_valid():
+    assert errors(
+        {
+            "field_id": 7,
+            "values": [
+                {"value": "Moscow", "subtype": "city"},
+                {"value": "101000", "subtype": "zip"},
+            ],
+        },
+        {
+            "field_id": 8,
+            "values": [
+                {"value": {"sku": "A-1", "quantity": 2, "unit_price": 100}},
+                {"value": {"sku": "B-2", "quantity": 1, "unit_price": 50}},
+            ],
+        },
+        {
+            "field_id": 9,
+            "values": [
+                {"value": {"name": "ACME", "vat_id": "7700000000"}},
+                {"value": {"name": "ACME 2", "vat_id": "7700000001"}},
+            ],
+        },
+    ) == []
+
+
+def test_chained_list_values_without_value_key_are_valid():
+    assert errors(
+        {"field_id": 10, "values": [{"catalog_id": 5, "catalog_element_id": 77}]}
+    ) == []
+
+
+def test_unknown_field_is_rejected():
+    assert errors({"field_id": 99, "values": [{"value": 1}]}) == [
+        "unknown leads custom field 99"
+    ]